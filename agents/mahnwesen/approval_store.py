@@ -74,6 +74,10 @@ class ApprovalStore:
     def __init__(self, base_path: Path | str = Path("artifacts/reports/mahnwesen")):
         self.base_path = Path(base_path)
         self._cache: dict[str, dict[str, ApprovalRecord]] = {}
+        # Per-tenant lookup indexes; the first record per key wins, matching the
+        # insertion-order scan they replace.
+        self._by_notice: dict[str, dict[str, ApprovalRecord]] = {}
+        self._by_notice_stage: dict[str, dict[tuple[str, DunningStage], ApprovalRecord]] = {}
 
     def register_pending(
         self,
@@ -103,6 +107,7 @@ class ApprovalStore:
                 correlation_id=correlation_id,
             )
             records[key] = record
+            self._index(tenant_id, record)
             self._persist(tenant_id)
         else:
             # keep existing record but refresh reason/status if still pending
@@ -218,8 +223,16 @@ class ApprovalStore:
             }
 
         self._cache[tenant_id] = records
+        self._by_notice[tenant_id] = {}
+        self._by_notice_stage[tenant_id] = {}
+        for record in records.values():
+            self._index(tenant_id, record)
         return records
 
+    def _index(self, tenant_id: str, record: ApprovalRecord) -> None:
+        self._by_notice[tenant_id].setdefault(record.notice_id, record)
+        self._by_notice_stage[tenant_id].setdefault((record.notice_id, record.stage), record)
+
     def _persist(self, tenant_id: str) -> None:
         records = self._cache.get(tenant_id, {})
         tenant_dir = self.base_path / tenant_id / "audit"
@@ -242,18 +255,12 @@ class ApprovalStore:
         return record
 
     def _get_optional(self, tenant_id: str, notice_id: str, stage: DunningStage) -> ApprovalRecord | None:
-        records = self._load_tenant(tenant_id)
-        for record in records.values():
-            if record.notice_id == notice_id and record.stage == stage:
-                return record
-        return None
+        self._load_tenant(tenant_id)
+        return self._by_notice_stage[tenant_id].get((notice_id, stage))
 
     def _get_optional_by_notice(self, tenant_id: str, notice_id: str) -> ApprovalRecord | None:
-        records = self._load_tenant(tenant_id)
-        for record in records.values():
-            if record.notice_id == notice_id:
-                return record
-        return None
+        self._load_tenant(tenant_id)
+        return self._by_notice[tenant_id].get(notice_id)
 
     @staticmethod
     def _key(idempotency_key: str) -> str:
@@ -5,6 +5,7 @@ and environment-based overrides.
 """
 
 import os
+import re
 from dataclasses import dataclass, field
 from decimal import Decimal
 from typing import Any
@@ -62,6 +63,11 @@ class DunningConfig:
     company_address: str = ""
     support_email: str = "support@0admin.com"
 
+    # Compiled stop list, keyed by the pattern tuple it was built from
+    _stop_list_cache: tuple[tuple[str, ...], tuple[re.Pattern[str], ...]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     @classmethod
     def from_tenant(cls, tenant_id: str) -> "DunningConfig":
         """Create configuration for specific tenant.
@@ -141,12 +147,23 @@ class DunningConfig:
         Returns:
             True if invoice should be excluded from dunning
         """
-        import re
+        return any(pattern.search(invoice_number) for pattern in self._compiled_stop_list())
+
+    def _compiled_stop_list(self) -> tuple[re.Pattern[str], ...]:
+        """Get the stop list patterns compiled case-insensitively.
+
+        Each pattern is compiled on its own, so inline flags keep their
+        meaning. The result is rebuilt whenever ``stop_list_patterns``
+        changes, including in-place list mutation.
 
-        for pattern in self.stop_list_patterns:
-            if re.search(pattern, invoice_number, re.IGNORECASE):
-                return True
-        return False
+        Returns:
+            Compiled patterns in configured order
+        """
+        key = tuple(self.stop_list_patterns)
+        if self._stop_list_cache is None or self._stop_list_cache[0] != key:
+            compiled = tuple(re.compile(pattern, re.IGNORECASE) for pattern in key)
+            self._stop_list_cache = (key, compiled)
+        return self._stop_list_cache[1]
 
     def to_dict(self) -> dict[str, Any]:
         """Convert configuration to dictionary.
@@ -12,6 +12,11 @@ from typing import Any
 from uuid import uuid4
 
 
+def cents_to_euro(amount_cents: int) -> str:
+    """Format an amount in cents as euro string with two decimals (e.g. 15000 -> "150.00")."""
+    return f"{amount_cents / 100:.2f}"
+
+
 class DunningStage(Enum):
     """Dunning stage enumeration."""
 
@@ -29,7 +34,7 @@ class DunningChannel(Enum):
     SMS = "sms"
 
 
-@dataclass
+@dataclass(slots=True)
 class OverdueInvoice:
     """Represents an overdue invoice for dunning processing."""
 
@@ -271,7 +276,7 @@ class DunningEvent:
             "channel": self.channel.value,
             "notice_ref": self.notice_ref,
             "due_date": self.due_date.isoformat() if self.due_date else None,
-            "amount": f"{self.amount_cents / 100:.2f}",  # Convert to string with 2 decimal places
+            "amount": cents_to_euro(self.amount_cents),
             "correlation_id": self.correlation_id,
         }
 
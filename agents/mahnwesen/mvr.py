@@ -6,6 +6,7 @@ applying limits, and ensuring idempotency in the dunning process.
 
 import hashlib
 import logging
+from collections import deque
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from enum import Enum
@@ -13,6 +14,11 @@ from enum import Enum
 from .config import DunningConfig
 
 
+def _now() -> datetime:
+    """Return the current UTC time (single seam for tests to freeze the clock)."""
+    return datetime.now(UTC)
+
+
 class DunningStage(Enum):
     """Dunning stage enumeration."""
 
@@ -21,7 +27,7 @@ class DunningStage(Enum):
     STAGE_3 = 3
 
 
-@dataclass
+@dataclass(slots=True)
 class OverdueInvoice:
     """Overdue invoice data structure."""
 
@@ -62,7 +68,7 @@ class MVREngine:
         self.logger = logging.getLogger(__name__)
 
         # Rate limiting state (in production, this would be in Redis/DB)
-        self._rate_limit_windows: dict[str, list[datetime]] = {}
+        self._rate_limit_windows: dict[str, deque[datetime]] = {}
 
     def determine_dunning_stage(self, invoice: OverdueInvoice) -> DunningStage:
         """Determine the appropriate dunning stage for an invoice.
@@ -79,7 +85,7 @@ class MVREngine:
             except ValueError:
                 pass
 
-        now = datetime.now(UTC)
+        now = _now()
         days_overdue = (now - invoice.due_date).days
 
         # Apply grace period
@@ -151,7 +157,7 @@ class MVREngine:
             invoice, "last_dunning_date", None
         )
         if last_dunning_date:
-            time_since_last = datetime.now(UTC) - last_dunning_date
+            time_since_last = _now() - last_dunning_date
             if time_since_last < timedelta(hours=24):
                 return DunningDecision(
                     should_send=False,
@@ -194,17 +200,14 @@ class MVREngine:
         Returns:
             True if within rate limits, False otherwise
         """
-        now = datetime.now(UTC)
+        now = _now()
         hour_ago = now - timedelta(hours=1)
 
-        # Get current window for tenant
-        if tenant_id not in self._rate_limit_windows:
-            self._rate_limit_windows[tenant_id] = []
+        window = self._get_rate_limit_window(tenant_id)
 
-        window = self._rate_limit_windows[tenant_id]
-
-        # Remove old entries
-        window[:] = [ts for ts in window if ts > hour_ago]
+        # Remove old entries (timestamps are appended in order)
+        while window and window[0] <= hour_ago:
+            window.popleft()
 
         # Check if within limit
         if len(window) >= self.config.max_notices_per_hour:
@@ -214,6 +217,21 @@ class MVREngine:
         window.append(now)
         return True
 
+    def _get_rate_limit_window(self, tenant_id: str) -> deque[datetime]:
+        """Return the tenant's send-timestamp window, creating it on first use.
+
+        Args:
+            tenant_id: Tenant identifier
+
+        Returns:
+            Deque of send timestamps, oldest first
+        """
+        window = self._rate_limit_windows.get(tenant_id)
+        if window is None:
+            window = deque()
+            self._rate_limit_windows[tenant_id] = window
+        return window
+
     def process_invoices(
         self, invoices: list[OverdueInvoice], dry_run: bool = False
     ) -> dict[DunningStage, list[tuple[OverdueInvoice, DunningDecision]]]:
@@ -260,7 +278,7 @@ class MVREngine:
         Returns:
             Dictionary with rate limit status
         """
-        now = datetime.now(UTC)
+        now = _now()
         hour_ago = now - timedelta(hours=1)
 
         if tenant_id not in self._rate_limit_windows:
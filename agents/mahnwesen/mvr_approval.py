@@ -4,6 +4,7 @@ Implementiert die 4-Augen-Kontrolle (Dual Authorization) für Mahnstufen 2 und 3
 Stufe 1 ist optional freigabepflichtig.
 """
 
+import functools
 import hashlib
 import logging
 from dataclasses import dataclass
@@ -13,6 +14,13 @@ from enum import Enum
 from .dto import DunningStage
 
 
+@functools.lru_cache(maxsize=4096)
+def _compute_approval_key(tenant_id: str, notice_id: str, stage_value: int) -> str:
+    """Berechnet den Approval-Key (gecacht, da deterministisch)."""
+    key_data = f"{tenant_id}|{notice_id}|{stage_value}"
+    return hashlib.sha256(key_data.encode()).hexdigest()[:16]
+
+
 class ApprovalStatus(Enum):
     """Status einer Freigabe."""
 
@@ -266,8 +274,7 @@ class MVRApprovalEngine:
         Returns:
             Approval-Key
         """
-        key_data = f"{tenant_id}|{notice_id}|{stage.value}"
-        return hashlib.sha256(key_data.encode()).hexdigest()[:16]
+        return _compute_approval_key(tenant_id, notice_id, stage.value)
 
     def get_pending_approvals(self, tenant_id: str) -> list[ApprovalRequest]:
         """Holt alle ausstehenden Freigabeanfragen für einen Tenant.
@@ -5,6 +5,7 @@ It handles workflow orchestration, template rendering, and event dispatch.
 """
 
 import logging
+from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
@@ -19,7 +20,7 @@ from backend.integrations.brevo_client import send_transactional
 from .approval_store import ApprovalStore
 from .clients import OutboxClient, ReadApiClient
 from .config import DunningConfig
-from .dto import DunningEvent, DunningNotice, DunningStage, OverdueInvoice
+from .dto import DunningEvent, DunningNotice, DunningStage, OverdueInvoice, cents_to_euro
 from .mvr import MVREngine
 from .mvr_approval import MVRApprovalEngine
 from .policies import DunningPolicies
@@ -212,7 +213,7 @@ class TemplateEngine:
         Returns:
             Formatted money string
         """
-        return f"{amount_cents / 100:.2f}"
+        return cents_to_euro(amount_cents)
 
     def _datefmt_filter(self, date_obj, format_str: str = "%Y-%m-%d") -> str:
         """Format date object as string.
@@ -280,13 +281,13 @@ class TemplateEngine:
             "amount_cents": notice.amount_cents,
             "dunning_fee_cents": notice.dunning_fee_cents,
             "total_amount_cents": notice.total_amount_cents,
-            "amount_str": f"{notice.amount_cents / 100:.2f}",
+            "amount_str": cents_to_euro(notice.amount_cents),
             "fee_str": (
-                f"{notice.dunning_fee_cents / 100:.2f}" if notice.dunning_fee_cents > 0 else "0.00"
+                cents_to_euro(notice.dunning_fee_cents) if notice.dunning_fee_cents > 0 else "0.00"
             ),
-            "total_str": f"{(notice.amount_cents + notice.dunning_fee_cents) / 100:.2f}",
+            "total_str": cents_to_euro(notice.amount_cents + notice.dunning_fee_cents),
             "fee": (
-                f"{notice.dunning_fee_cents / 100:.2f}" if notice.dunning_fee_cents > 0 else "0.00"
+                cents_to_euro(notice.dunning_fee_cents) if notice.dunning_fee_cents > 0 else "0.00"
             ),
             "notice_ref": notice.notice_id,
             "locale": self.config.default_locale,
@@ -347,13 +348,15 @@ class DunningResult:
 class DunningPlaybook:
     """Flock-based dunning playbook orchestrator."""
 
-    def __init__(self, config: DunningConfig):
+    def __init__(self, config: DunningConfig, *, sender: Callable[..., Any] | None = None):
         """Initialize playbook.
 
         Args:
             config: Dunning configuration
+            sender: Optional replacement for Brevo ``send_transactional``
         """
         self.config = config
+        self.sender = sender
         self.logger = logging.getLogger(__name__)
 
     def run_once(self, context: DunningContext) -> DunningResult:
@@ -802,8 +805,9 @@ class DunningPlaybook:
         Returns:
             BrevoResponse with success status
         """
+        sender = self.sender or send_transactional
         try:
-            return send_transactional(
+            return sender(
                 to=notice.recipient_email,
                 subject=notice.subject,
                 html=notice.content,
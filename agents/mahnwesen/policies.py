@@ -4,6 +4,7 @@ Implements deterministic, functional policies for determining
 dunning stages and channels based on invoice data.
 """
 
+from bisect import bisect_right
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from decimal import Decimal
@@ -11,8 +12,16 @@ from decimal import Decimal
 from .config import DunningConfig
 from .dto import DunningChannel, DunningStage
 
+# Stage for the number of thresholds reached (index into bisect_right result)
+_STAGES_BY_RANK = (
+    DunningStage.NONE,
+    DunningStage.STAGE_1,
+    DunningStage.STAGE_2,
+    DunningStage.STAGE_3,
+)
 
-@dataclass
+
+@dataclass(slots=True)
 class OverdueInvoice:
     """Represents an overdue invoice for policy evaluation."""
 
@@ -39,12 +48,27 @@ class OverdueInvoice:
         return (now - self.due_date).days
 
 
+# Channel per (stage, has customer email):
+# Stage 1 email only, Stage 2 email if available else letter, Stage 3 formal letter
+_CHANNEL_TABLE: dict[tuple[DunningStage, bool], DunningChannel] = {
+    (DunningStage.STAGE_1, True): DunningChannel.EMAIL,
+    (DunningStage.STAGE_1, False): DunningChannel.EMAIL,
+    (DunningStage.STAGE_2, True): DunningChannel.EMAIL,
+    (DunningStage.STAGE_2, False): DunningChannel.LETTER,
+    (DunningStage.STAGE_3, True): DunningChannel.LETTER,
+    (DunningStage.STAGE_3, False): DunningChannel.LETTER,
+}
+
+
 class DunningPolicies:
     """Business policies for dunning decisions.
 
     All methods are pure functions for deterministic behavior.
     """
 
+    # Base fee in cents, indexed by DunningStage.value (NONE, 2.50, 5.00, 10.00 EUR)
+    _FEE_BY_STAGE = (0, 250, 500, 1000)
+
     def __init__(self, config: DunningConfig):
         """Initialize with configuration.
 
@@ -52,6 +76,28 @@ class DunningPolicies:
             config: Dunning configuration
         """
         self.config = config
+        self._bounds_key: tuple[int, int, int] | None = None
+        self._ascending_bounds: tuple[int, int, int] | None = None
+        self._delays_key: tuple[int, int, int] | None = None
+        self._escalation_delays: dict[tuple[DunningStage, DunningStage], int] = {}
+
+    def _stage_bounds(self) -> tuple[int, int, int] | None:
+        """Get the stage thresholds as a bisect table.
+
+        The table is rebuilt whenever the configured thresholds change.
+
+        Returns:
+            (stage_1, stage_2, stage_3) thresholds, or None if not ascending
+        """
+        bounds = (
+            self.config.stage_1_threshold,
+            self.config.stage_2_threshold,
+            self.config.stage_3_threshold,
+        )
+        if bounds != self._bounds_key:
+            self._bounds_key = bounds
+            self._ascending_bounds = bounds if list(bounds) == sorted(bounds) else None
+        return self._ascending_bounds
 
     def determine_dunning_stage(
         self, invoice: OverdueInvoice, now: datetime | None = None
@@ -77,7 +123,11 @@ class DunningPolicies:
         if effective_days < 0:
             return DunningStage.NONE
 
-        # Determine stage based on thresholds
+        bounds = self._stage_bounds()
+        if bounds is not None:
+            return _STAGES_BY_RANK[bisect_right(bounds, effective_days)]
+
+        # Thresholds out of order: check from the highest stage down
         if effective_days >= self.config.stage_3_threshold:
             return DunningStage.STAGE_3
         elif effective_days >= self.config.stage_2_threshold:
@@ -87,6 +137,40 @@ class DunningPolicies:
         else:
             return DunningStage.NONE
 
+    def determine_dunning_stages(
+        self, invoices: list[OverdueInvoice], now: datetime | None = None
+    ) -> list[DunningStage]:
+        """Determine dunning stages for a batch of invoices.
+
+        Batch counterpart of ``determine_dunning_stage``: the clock and the
+        thresholds are read once and each invoice costs one subtraction and
+        one bisect.
+
+        Args:
+            invoices: Overdue invoices
+            now: Current timestamp (for testing)
+
+        Returns:
+            Dunning stages in invoice order
+        """
+        if now is None:
+            now = datetime.now(UTC)
+
+        bounds = self._stage_bounds()
+        if bounds is None:
+            # Bisect needs ascending thresholds; keep exact per-invoice semantics otherwise
+            return [self.determine_dunning_stage(invoice, now) for invoice in invoices]
+
+        grace_days = self.config.grace_days
+        stages = []
+        for invoice in invoices:
+            effective_days = (now - invoice.due_date).days - grace_days
+            if effective_days < 0:
+                stages.append(DunningStage.NONE)
+            else:
+                stages.append(_STAGES_BY_RANK[bisect_right(bounds, effective_days)])
+        return stages
+
     def determine_dunning_channel(
         self, invoice: OverdueInvoice, stage: DunningStage
     ) -> DunningChannel:
@@ -99,23 +183,8 @@ class DunningPolicies:
         Returns:
             Communication channel
         """
-        # Stage 1: Email only
-        if stage == DunningStage.STAGE_1:
-            return DunningChannel.EMAIL
-
-        # Stage 2: Email + SMS (if available)
-        elif stage == DunningStage.STAGE_2:
-            if invoice.customer_email:
-                return DunningChannel.EMAIL
-            else:
-                return DunningChannel.LETTER
-
-        # Stage 3: Letter (formal legal notice)
-        elif stage == DunningStage.STAGE_3:
-            return DunningChannel.LETTER
-
-        # Default fallback
-        return DunningChannel.EMAIL
+        # Default fallback (e.g. NONE): email
+        return _CHANNEL_TABLE.get((stage, bool(invoice.customer_email)), DunningChannel.EMAIL)
 
     def should_issue_dunning(
         self, invoice: OverdueInvoice, now: datetime | None = None
@@ -177,14 +246,7 @@ class DunningPolicies:
         Returns:
             Dunning fee in cents
         """
-        # Base fee per stage
-        base_fees = {
-            DunningStage.STAGE_1: 250,  # 2.50 EUR
-            DunningStage.STAGE_2: 500,  # 5.00 EUR
-            DunningStage.STAGE_3: 1000,  # 10.00 EUR
-        }
-
-        return base_fees.get(stage, 0)
+        return self._FEE_BY_STAGE[stage.value]
 
     def get_escalation_delay_days(
         self, current_stage: DunningStage, next_stage: DunningStage
@@ -198,12 +260,18 @@ class DunningPolicies:
         Returns:
             Days to wait before escalation
         """
-        if current_stage == DunningStage.STAGE_1 and next_stage == DunningStage.STAGE_2:
-            return self.config.stage_2_threshold - self.config.stage_1_threshold
-        elif current_stage == DunningStage.STAGE_2 and next_stage == DunningStage.STAGE_3:
-            return self.config.stage_3_threshold - self.config.stage_2_threshold
-        else:
-            return 0
+        bounds = (
+            self.config.stage_1_threshold,
+            self.config.stage_2_threshold,
+            self.config.stage_3_threshold,
+        )
+        if bounds != self._delays_key:
+            self._delays_key = bounds
+            self._escalation_delays = {
+                (DunningStage.STAGE_1, DunningStage.STAGE_2): bounds[1] - bounds[0],
+                (DunningStage.STAGE_2, DunningStage.STAGE_3): bounds[2] - bounds[1],
+            }
+        return self._escalation_delays.get((current_stage, next_stage), 0)
 
     def filter_overdue_invoices(
         self, invoices: list[OverdueInvoice], now: datetime | None = None
@@ -221,13 +289,14 @@ class DunningPolicies:
             now = datetime.now(UTC)
 
         eligible = []
+        stages = self.determine_dunning_stages(invoices, now)
 
-        for invoice in invoices:
-            should_issue, error_msg = self.should_issue_dunning(invoice, now)
+        for invoice, stage in zip(invoices, stages, strict=True):
+            if stage == DunningStage.NONE:
+                continue
+            should_issue, _error_msg = self.should_issue_dunning(invoice, now)
             if should_issue:
-                stage = self.determine_dunning_stage(invoice, now)
-                if stage != DunningStage.NONE:
-                    eligible.append(invoice)
+                eligible.append(invoice)
 
         return eligible
 
@@ -252,11 +321,13 @@ class DunningPolicies:
             DunningStage.STAGE_3: [],
         }
 
-        for invoice in invoices:
-            should_issue, error_msg = self.should_issue_dunning(invoice, now)
+        stages = self.determine_dunning_stages(invoices, now)
+
+        for invoice, stage in zip(invoices, stages, strict=True):
+            if stage not in groups:
+                continue
+            should_issue, _error_msg = self.should_issue_dunning(invoice, now)
             if should_issue:
-                stage = self.determine_dunning_stage(invoice, now)
-                if stage in groups:
-                    groups[stage].append(invoice)
+                groups[stage].append(invoice)
 
         return groups
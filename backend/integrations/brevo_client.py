@@ -6,6 +6,8 @@ Supports dry-run mode for testing and development.
 
 import logging
 import os
+import time
+from collections import defaultdict, deque
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from typing import Any
@@ -14,6 +16,11 @@ import httpx
 
 from agents.comm.outbound_tags import generate_message_id
 
+# Soft-bounce policy: max 3 attempts in a rolling 72h window
+_SOFT_BOUNCE_MAX_ATTEMPTS = 3
+_SOFT_BOUNCE_WINDOW_NS = 72 * 3600 * 1_000_000_000
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
 
 @dataclass
 class BrevoEmail:
@@ -53,9 +60,9 @@ class BrevoClient:
         # Hard-bounce tracking (in production, this would be in Redis/DB)
         self._hard_bounces = set()
 
-        # Soft-bounce tracking: email -> [(timestamp, attempt_count)]
+        # Soft-bounce tracking: email -> epoch-ns timestamps, oldest first
         # Policy: Max 3 Versuche in 72h, danach Hard-Bounce
-        self._soft_bounces: dict[str, list[datetime]] = {}
+        self._soft_bounces: defaultdict[str, deque[int]] = defaultdict(deque)
 
         # Validate required configuration
         if not self.api_key:
@@ -277,6 +284,24 @@ class BrevoClient:
         """
         return self._hard_bounces.copy()
 
+    def _prune_soft_bounces(self, email_lower: str) -> deque[int] | None:
+        """Drop soft-bounce attempts outside the 72h window.
+
+        Args:
+            email_lower: Lower-cased email address
+
+        Returns:
+            Remaining attempts (oldest first), or None if none were recorded
+        """
+        attempts = self._soft_bounces.get(email_lower)
+        if attempts is None:
+            return None
+
+        cutoff = time.time_ns() - _SOFT_BOUNCE_WINDOW_NS
+        while attempts and attempts[0] <= cutoff:
+            attempts.popleft()
+        return attempts
+
     def _check_soft_bounce_policy(self, email: str) -> tuple[bool, str | None]:
         """Check soft-bounce policy: max 3 attempts in 72h.
 
@@ -286,23 +311,15 @@ class BrevoClient:
         Returns:
             Tuple (can_retry, reason)
         """
-        email_lower = email.lower()
-        now = datetime.now(UTC)
-        window_start = now - timedelta(hours=72)
-
-        if email_lower not in self._soft_bounces:
+        attempts = self._prune_soft_bounces(email.lower())
+        if not attempts:
             return True, None
 
-        # Clean old attempts (outside 72h window)
-        attempts = self._soft_bounces[email_lower]
-        attempts_in_window = [ts for ts in attempts if ts > window_start]
-        self._soft_bounces[email_lower] = attempts_in_window
-
         # Check policy: max 3 attempts in 72h
-        if len(attempts_in_window) >= 3:
+        if len(attempts) >= _SOFT_BOUNCE_MAX_ATTEMPTS:
             return (
                 False,
-                f"Max 3 soft-bounce attempts in 72h exceeded ({len(attempts_in_window)} attempts)",
+                f"Max 3 soft-bounce attempts in 72h exceeded ({len(attempts)} attempts)",
             )
 
         return True, None
@@ -314,14 +331,9 @@ class BrevoClient:
             email: Email address that soft-bounced
         """
         email_lower = email.lower()
-        now = datetime.now(UTC)
-
-        if email_lower not in self._soft_bounces:
-            self._soft_bounces[email_lower] = []
+        self._soft_bounces[email_lower].append(time.time_ns())
 
-        self._soft_bounces[email_lower].append(now)
-
-        # Check if policy exceeded
+        # Check if policy exceeded (also prunes attempts outside the window)
         can_retry, reason = self._check_soft_bounce_policy(email)
         if not can_retry:
             self.logger.warning(
@@ -344,9 +356,7 @@ class BrevoClient:
         Returns:
             Dictionary with soft-bounce status
         """
-        email_lower = email.lower()
-
-        if email_lower not in self._soft_bounces:
+        if email.lower() not in self._soft_bounces:
             return {
                 "email": email,
                 "attempts": 0,
@@ -355,15 +365,18 @@ class BrevoClient:
                 "policy": "max 3 attempts in 72h",
             }
 
-        now = datetime.now(UTC)
-        window_start = now - timedelta(hours=72)
-        attempts_in_window = [ts for ts in self._soft_bounces[email_lower] if ts > window_start]
         can_retry, reason = self._check_soft_bounce_policy(email)
+        attempts = self._soft_bounces[email.lower()]
+        last_attempt = (
+            (_EPOCH + timedelta(microseconds=attempts[-1] // 1000)).isoformat()
+            if attempts
+            else None
+        )
 
         return {
             "email": email,
-            "attempts": len(attempts_in_window),
-            "last_attempt": max(attempts_in_window).isoformat() if attempts_in_window else None,
+            "attempts": len(attempts),
+            "last_attempt": last_attempt,
             "can_retry": can_retry,
             "reason": reason,
             "policy": "max 3 attempts in 72h",
@@ -0,0 +1,58 @@
+"""Lightweight test doubles and filesystem helpers for Mahnwesen tests.
+
+TemplateEngine.render_notice only reads attributes from the notice and writes
+``content``/``subject`` back, so template tests can use a slotted stand-in
+instead of the full DunningNotice.
+"""
+
+import json
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from agents.mahnwesen import mvr
+from agents.mahnwesen.dto import DunningChannel, DunningStage
+
+
+@dataclass(slots=True)
+class DunningNoticeStub:
+    """Slotted mirror of DunningNotice with the fields used for rendering."""
+
+    notice_id: str = "NOTICE-STUB"
+    tenant_id: str = ""
+    invoice_id: str = ""
+    stage: DunningStage = DunningStage.STAGE_1
+    channel: DunningChannel = DunningChannel.EMAIL
+    subject: str = ""
+    content: str = ""
+    recipient_email: str | None = None
+    recipient_name: str | None = None
+    recipient_address: str | None = None
+    due_date: datetime | None = None
+    amount_cents: int = 0
+    dunning_fee_cents: int = 0
+    total_amount_cents: int = 0
+    customer_name: str | None = None
+    invoice_number: str | None = None
+    notice_ref: str | None = None
+    template_version: str = "v1"
+    locale: str = "de-DE"
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+
+def ensure_tree(root: Path, subdirs: Iterable[str]) -> None:
+    """Create ``root/<subdir>`` for every subdir, including missing parents."""
+    for sub in subdirs:
+        (root / sub).mkdir(parents=True, exist_ok=True)
+
+
+def dump_json_bytes(data: Any) -> bytes:
+    """Serialize ``data`` to compact UTF-8 JSON for ``Path.write_bytes``."""
+    return json.dumps(data).encode("utf-8")
+
+
+def seed_rate_limit(engine: mvr.MVREngine, tenant_id: str, count: int) -> None:
+    """Fill ``tenant_id``'s rate-limit window with ``count`` current sends."""
+    engine._get_rate_limit_window(tenant_id).extend([mvr._now()] * count)
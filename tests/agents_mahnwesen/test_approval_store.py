@@ -91,3 +91,13 @@ def test_mark_sent_persists_status(store: ApprovalStore) -> None:
 def test_get_by_notice_returns_none_when_missing(store: ApprovalStore) -> None:
     assert store.get_by_notice(TENANT_ID, "UNKNOWN") is None
 
+
+
+def test_get_by_notice_after_reload(store: ApprovalStore, tmp_path) -> None:
+    _create_pending(store)
+
+    reloaded = ApprovalStore(base_path=tmp_path)
+    record = reloaded.get_by_notice(TENANT_ID, "NOTICE-INV-S2-001")
+    assert record is not None
+    assert record.stage == DunningStage.STAGE_2
+    assert reloaded.get_by_notice(TENANT_ID, "UNKNOWN") is None
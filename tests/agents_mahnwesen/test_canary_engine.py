@@ -10,6 +10,11 @@ import pytest
 
 from tools.operate.canary_engine import generate_decision, write_decision, determine_next_action
 
+_NOW = datetime(2025, 10, 29, 8, 0, tzinfo=UTC)
+
+# File-I/O bound; keep on one xdist worker under --dist=loadgroup
+pytestmark = pytest.mark.xdist_group("canary_io")
+
 
 @pytest.fixture
 def base_setup(tmp_path: Path) -> tuple[str, Path]:
@@ -63,6 +68,7 @@ def test_generate_decision_go_25(base_setup: tuple[str, Path]) -> None:
     decision = generate_decision(tenant, report_date, base_path=base)
     assert decision["recommended_action"] == "GO_25"
     assert decision["metrics"]["error_rate"] == 0.0
+    assert decision["reason_codes"] == []
 
 
 def test_generate_decision_hold_due_to_errors(base_setup: tuple[str, Path]) -> None:
@@ -75,7 +81,7 @@ def test_generate_decision_hold_due_to_errors(base_setup: tuple[str, Path]) -> N
 
     decision = generate_decision(tenant, report_date, base_path=base)
     assert decision["recommended_action"] == "HOLD"
-    assert any("Error rate" in reason for reason in decision["reasons"])
+    assert "ERROR_RATE_EXCEEDED" in decision["reason_codes"]
 
 
 def test_write_decision_creates_files(base_setup: tuple[str, Path], tmp_path: Path) -> None:
@@ -86,9 +92,10 @@ def test_write_decision_creates_files(base_setup: tuple[str, Path], tmp_path: Pa
     _write_blocklist(tenant_dir, hard=0)
     _write_state(tenant_dir, rollout=10)
 
-    decision = generate_decision(tenant, report_date, base_path=base)
-    now = datetime.now(UTC)
-    json_path, md_path = write_decision(tenant, decision, report_date, now, base_path=base)
+    decision = generate_decision(tenant, report_date, base_path=base, now=_NOW)
+    json_path, md_path = write_decision(tenant, decision, report_date, _NOW, base_path=base)
     assert json_path.exists()
     assert md_path.exists()
+    assert json_path.name == "2025-10-29_0800_decision.json"
+    assert decision["generated_at"] == _NOW.isoformat()
 
@@ -10,6 +10,11 @@ import pytest
 
 from tools.operate.canary_rollout import apply_rollout, load_operate_state, persist_state
 
+_NOW = datetime(2025, 10, 29, 8, 0, tzinfo=UTC)
+
+# File-I/O bound; keep on one xdist worker under --dist=loadgroup
+pytestmark = pytest.mark.xdist_group("canary_io")
+
 
 @pytest.fixture
 def tenant_setup(tmp_path: Path) -> tuple[str, Path, Path]:
@@ -30,32 +35,37 @@ def _write_decision(path: Path, action: str, reasons: list[str]) -> Path:
         "recommended_action": action,
         "reasons": reasons,
         "report_date": "2025-10-29",
-        "generated_at": datetime.now(UTC).isoformat(),
+        "generated_at": _NOW.isoformat(),
     }
     file_path = path / "2025-10-29_0800_decision.json"
-    file_path.write_text(json.dumps(decision), encoding="utf-8")
+    file_path.write_bytes(json.dumps(decision).encode("utf-8"))
     return file_path
 
 
+def _read_decision(file_path: Path) -> dict:
+    return json.loads(file_path.read_bytes())
+
+
 def test_apply_rollout_step_up(tenant_setup: tuple[str, Path, Path]) -> None:
     tenant, base, canary_dir = tenant_setup
     decision_path = _write_decision(canary_dir, "GO_25", ["All thresholds satisfied"])
+    decision = _read_decision(decision_path)
 
-    result = apply_rollout(tenant, json.loads(decision_path.read_text()), "trace-1", base_path=base)
+    result = apply_rollout(tenant, decision, "trace-1", base_path=base)
     assert result["after"]["rollout_percentage"] == 25
     assert result["after"]["kill_switch"] is False
     assert result["changed"] is True
 
     # Applying same decision again should be idempotent
-    result_again = apply_rollout(tenant, json.loads(decision_path.read_text()), "trace-2", base_path=base)
+    result_again = apply_rollout(tenant, decision, "trace-2", base_path=base)
     assert result_again["changed"] is False
 
 
 def test_apply_rollout_backout(tenant_setup: tuple[str, Path, Path]) -> None:
     tenant, base, canary_dir = tenant_setup
     decision_path = _write_decision(canary_dir, "BACKOUT", ["Hard bounce spike"])
+    decision = _read_decision(decision_path)
 
-    result = apply_rollout(tenant, json.loads(decision_path.read_text()), "trace-backout", base_path=base)
+    result = apply_rollout(tenant, decision, "trace-backout", base_path=base)
     assert result["after"]["kill_switch"] is True
     assert result["after"]["rollout_percentage"] == 10
-
@@ -4,13 +4,60 @@ Tests the Jinja2 template rendering for dunning notices
 without external dependencies.
 """
 
+from dataclasses import fields, replace
 from datetime import UTC, datetime, timedelta
 
 import pytest
 
 from agents.mahnwesen.config import DunningConfig
-from agents.mahnwesen.dto import DunningChannel, DunningNotice, DunningStage
+from agents.mahnwesen.dto import DunningChannel, DunningNotice, DunningStage, cents_to_euro
 from agents.mahnwesen.playbooks import TemplateEngine
+from tests.agents_mahnwesen._fixtures import DunningNoticeStub
+
+# Immutable-by-intent templates; tests derive variants via dataclasses.replace.
+# Notices use the slotted stub; test_notice_stub_matches_dto guards field parity.
+_BASE_CONFIG = DunningConfig(
+    tenant_id="00000000-0000-0000-0000-000000000001",
+    company_name="Test Company",
+    company_address="Test Street 123, 12345 Test City",
+    support_email="support@test.com",
+)
+
+_BASE_NOTICE = DunningNoticeStub(
+    notice_id="NOTICE-001",
+    tenant_id="00000000-0000-0000-0000-000000000001",
+    invoice_id="INV-001",
+    stage=DunningStage.STAGE_1,
+    channel=DunningChannel.EMAIL,
+    recipient_email="customer@example.com",
+    recipient_name="Test Customer",
+    amount_cents=15000,  # 150.00 EUR
+    dunning_fee_cents=250,  # 2.50 EUR
+    total_amount_cents=15250,  # 152.50 EUR
+    template_version="v1",
+    locale="de-DE",
+)
+
+_EMPTY_OPTIONAL_NOTICE = DunningNoticeStub(
+    notice_id="NOTICE-002",
+    tenant_id="00000000-0000-0000-0000-000000000001",
+    invoice_id="INV-002",
+    stage=DunningStage.STAGE_1,
+    channel=DunningChannel.EMAIL,
+    recipient_email=None,
+    recipient_name=None,
+    due_date=None,
+    amount_cents=10000,
+    dunning_fee_cents=250,
+    total_amount_cents=10250,
+)
+
+
+_STAGE_EXPECT = (
+    (DunningStage.STAGE_1, "Zahlungserinnerung"),
+    (DunningStage.STAGE_2, "2. Mahnung"),
+    (DunningStage.STAGE_3, "Letzte Mahnung"),
+)
 
 
 class TestTemplateComposition:
@@ -19,12 +66,8 @@ class TestTemplateComposition:
     @pytest.fixture
     def config(self):
         """Create test configuration."""
-        return DunningConfig(
-            tenant_id="00000000-0000-0000-0000-000000000001",
-            company_name="Test Company",
-            company_address="Test Street 123, 12345 Test City",
-            support_email="support@test.com",
-        )
+        # Copy so tests mutating the config cannot leak into other tests
+        return replace(_BASE_CONFIG)
 
     @pytest.fixture
     def template_engine(self, config):
@@ -34,26 +77,17 @@ class TestTemplateComposition:
     @pytest.fixture
     def sample_notice(self):
         """Create sample dunning notice."""
-        return DunningNotice(
-            notice_id="NOTICE-001",
-            tenant_id="00000000-0000-0000-0000-000000000001",
-            invoice_id="INV-001",
-            stage=DunningStage.STAGE_1,
-            channel=DunningChannel.EMAIL,
-            recipient_email="customer@example.com",
-            recipient_name="Test Customer",
-            due_date=datetime.now(UTC) - timedelta(days=5),
-            amount_cents=15000,  # 150.00 EUR
-            dunning_fee_cents=250,  # 2.50 EUR
-            total_amount_cents=15250,  # 152.50 EUR
-            template_version="v1",
-            locale="de-DE",
-        )
+        return replace(_BASE_NOTICE, due_date=datetime.now(UTC) - timedelta(days=5))
+
+    @pytest.fixture
+    def rendered_stage(self, request, template_engine, sample_notice):
+        """Render sample_notice for the stage given via indirect parametrization."""
+        stage = request.param
+        return template_engine.render_notice(replace(sample_notice, stage=stage), stage)
 
     def test_stage_1_template_rendering(self, template_engine, sample_notice):
         """Test stage 1 template rendering."""
-        notice = sample_notice
-        notice.stage = DunningStage.STAGE_1
+        notice = replace(sample_notice, stage=DunningStage.STAGE_1)
 
         rendered = template_engine.render_notice(notice, DunningStage.STAGE_1)
 
@@ -70,10 +104,12 @@ class TestTemplateComposition:
 
     def test_stage_2_template_rendering(self, template_engine, sample_notice):
         """Test stage 2 template rendering."""
-        notice = sample_notice
-        notice.stage = DunningStage.STAGE_2
-        notice.dunning_fee_cents = 500  # 5.00 EUR
-        notice.total_amount_cents = 15500  # 155.00 EUR
+        notice = replace(
+            sample_notice,
+            stage=DunningStage.STAGE_2,
+            dunning_fee_cents=500,  # 5.00 EUR
+            total_amount_cents=15500,  # 155.00 EUR
+        )
 
         rendered = template_engine.render_notice(notice, DunningStage.STAGE_2)
 
@@ -91,10 +127,12 @@ class TestTemplateComposition:
 
     def test_stage_3_template_rendering(self, template_engine, sample_notice):
         """Test stage 3 template rendering."""
-        notice = sample_notice
-        notice.stage = DunningStage.STAGE_3
-        notice.dunning_fee_cents = 1000  # 10.00 EUR
-        notice.total_amount_cents = 16000  # 160.00 EUR
+        notice = replace(
+            sample_notice,
+            stage=DunningStage.STAGE_3,
+            dunning_fee_cents=1000,  # 10.00 EUR
+            total_amount_cents=16000,  # 160.00 EUR
+        )
 
         rendered = template_engine.render_notice(notice, DunningStage.STAGE_3)
 
@@ -110,21 +148,20 @@ class TestTemplateComposition:
         assert "160.00" in rendered.content  # Total amount
         assert "rechtliche Schritte" in rendered.content  # Legal notice
 
-    def test_subject_extraction(self, template_engine, sample_notice):
+    @pytest.mark.parametrize("rendered_stage", [DunningStage.STAGE_1], indirect=True)
+    def test_subject_extraction(self, rendered_stage, sample_notice):
         """Test subject line extraction."""
-        notice = sample_notice
-
-        rendered = template_engine.render_notice(notice, DunningStage.STAGE_1)
+        rendered = rendered_stage
 
         # Check subject extraction
         assert rendered.subject
         assert "Zahlungserinnerung" in rendered.subject
-        assert notice.invoice_id in rendered.subject
+        assert sample_notice.invoice_id in rendered.subject
 
-    def test_fallback_content(self, template_engine, sample_notice):
+    def test_fallback_content(self, template_engine, sample_notice, monkeypatch):
         """Test fallback content when template fails."""
         # Mock template failure by providing invalid template
-        template_engine.templates = {"stage_1": "{{ invalid_template"}
+        monkeypatch.setattr(template_engine, "templates", {"stage_1": "{{ invalid_template"})
 
         rendered = template_engine.render_notice(sample_notice, DunningStage.STAGE_1)
 
@@ -134,100 +171,79 @@ class TestTemplateComposition:
         assert "Zahlungserinnerung" in rendered.content
         assert sample_notice.invoice_id in rendered.content
 
-    def test_amount_formatting(self, template_engine, sample_notice):
-        """Test amount formatting in templates."""
-        notice = sample_notice
-        notice.amount_cents = 123456  # 1234.56 EUR
-        notice.dunning_fee_cents = 250  # 2.50 EUR
-        notice.total_amount_cents = 123706  # 1237.06 EUR
-
-        rendered = template_engine.render_notice(notice, DunningStage.STAGE_1)
-
-        # Check amount formatting
-        assert "1234.56" in rendered.content  # Original amount
-        assert "2.50" in rendered.content  # Dunning fee
-        assert "1237.06" in rendered.content  # Total amount
-
-    def test_date_formatting(self, template_engine, sample_notice):
-        """Test date formatting in templates."""
-        notice = sample_notice
-        notice.due_date = datetime(2024, 1, 15, 12, 0, 0, tzinfo=UTC)
-
-        rendered = template_engine.render_notice(notice, DunningStage.STAGE_1)
-
-        # Check date formatting (DD.MM.YYYY)
-        assert "15.01.2024" in rendered.content
-
-    def test_company_information(self, template_engine, sample_notice):
+    @pytest.mark.parametrize("rendered_stage", [DunningStage.STAGE_1], indirect=True)
+    def test_company_information(self, rendered_stage):
         """Test company information in templates."""
-        rendered = template_engine.render_notice(sample_notice, DunningStage.STAGE_1)
+        rendered = rendered_stage
 
         # Check company information
         assert "Test Company" in rendered.content
         assert "Test Street 123, 12345 Test City" in rendered.content
         assert "support@test.com" in rendered.content
 
-    def test_recipient_information(self, template_engine, sample_notice):
+    @pytest.mark.parametrize("rendered_stage", [DunningStage.STAGE_1], indirect=True)
+    def test_recipient_information(self, rendered_stage):
         """Test recipient information in templates."""
-        rendered = template_engine.render_notice(sample_notice, DunningStage.STAGE_1)
+        rendered = rendered_stage
 
         # Check recipient information
         assert "customer@example.com" in rendered.content
         assert "Test Customer" in rendered.content
 
-    def test_template_variables(self, template_engine, sample_notice):
-        """Test template variable substitution."""
-        # Test with specific values
-        notice = sample_notice
-        notice.invoice_id = "INV-TEST-123"
-        notice.amount_cents = 50000  # 500.00 EUR
-        notice.dunning_fee_cents = 750  # 7.50 EUR
-        notice.total_amount_cents = 50750  # 507.50 EUR
-        notice.due_date = datetime(2024, 3, 10, 0, 0, 0, tzinfo=UTC)
+    @pytest.mark.parametrize(
+        "stage,field_updates,expected_substrs",
+        [
+            (
+                DunningStage.STAGE_1,
+                {
+                    "amount_cents": 123456,  # 1234.56 EUR
+                    "dunning_fee_cents": 250,  # 2.50 EUR
+                    "total_amount_cents": 123706,  # 1237.06 EUR
+                    "due_date": datetime(2024, 1, 15, 12, 0, 0, tzinfo=UTC),
+                },
+                ("1234.56", "2.50", "1237.06", "15.01.2024"),
+            ),
+            (
+                DunningStage.STAGE_2,
+                {
+                    "invoice_id": "INV-TEST-123",
+                    "amount_cents": 50000,  # 500.00 EUR
+                    "dunning_fee_cents": 750,  # 7.50 EUR
+                    "total_amount_cents": 50750,  # 507.50 EUR
+                    "due_date": datetime(2024, 3, 10, 0, 0, 0, tzinfo=UTC),
+                },
+                ("INV-TEST-123", "500.00", "7.50", "507.50", "10.03.2024"),
+            ),
+        ],
+        ids=["amount-and-date-formatting", "variable-substitution"],
+    )
+    def test_template_formatting(
+        self, template_engine, sample_notice, stage, field_updates, expected_substrs
+    ):
+        """Test amount/date formatting and variable substitution in one render."""
+        notice = replace(sample_notice, **field_updates)
 
-        rendered = template_engine.render_notice(notice, DunningStage.STAGE_2)
+        rendered = template_engine.render_notice(notice, stage)
 
-        # Check variable substitution
-        assert "INV-TEST-123" in rendered.content
-        assert "500.00" in rendered.content
-        assert "7.50" in rendered.content
-        assert "507.50" in rendered.content
-        assert "10.03.2024" in rendered.content
+        # Amounts as 0.00, dates as DD.MM.YYYY, invoice id substituted
+        missing = [text for text in expected_substrs if text not in rendered.content]
+        assert not missing, f"Missing in rendered content: {missing}"
 
-    def test_multiple_stages(self, template_engine, sample_notice):
+    @pytest.mark.parametrize(
+        "rendered_stage,expected_text", _STAGE_EXPECT, indirect=["rendered_stage"]
+    )
+    def test_multiple_stages(self, rendered_stage, expected_text):
         """Test template rendering for multiple stages."""
-        stages = [
-            (DunningStage.STAGE_1, "Zahlungserinnerung"),
-            (DunningStage.STAGE_2, "2. Mahnung"),
-            (DunningStage.STAGE_3, "Letzte Mahnung"),
-        ]
-
-        for stage, expected_text in stages:
-            notice = sample_notice
-            notice.stage = stage
-
-            rendered = template_engine.render_notice(notice, stage)
+        rendered = rendered_stage
 
-            # Check stage-specific content
-            assert expected_text in rendered.content
-            assert rendered.subject
-            assert rendered.content
+        # Check stage-specific content
+        assert expected_text in rendered.content
+        assert rendered.subject
+        assert rendered.content
 
     def test_empty_optional_fields(self, template_engine):
         """Test template rendering with empty optional fields."""
-        notice = DunningNotice(
-            notice_id="NOTICE-002",
-            tenant_id="00000000-0000-0000-0000-000000000001",
-            invoice_id="INV-002",
-            stage=DunningStage.STAGE_1,
-            channel=DunningChannel.EMAIL,
-            recipient_email=None,
-            recipient_name=None,
-            due_date=None,
-            amount_cents=10000,
-            dunning_fee_cents=250,
-            total_amount_cents=10250,
-        )
+        notice = replace(_EMPTY_OPTIONAL_NOTICE)
 
         rendered = template_engine.render_notice(notice, DunningStage.STAGE_1)
 
@@ -263,20 +279,32 @@ class TestTemplateComposition:
         assert "custom@company.com" in rendered.content
         assert "Custom Address" in rendered.content
 
+    def test_notice_stub_matches_dto(self):
+        """Test that the render stub only uses real DunningNotice fields."""
+        stub_fields = {f.name: f.type for f in fields(DunningNoticeStub)}
+        dto_fields = {f.name: f.type for f in fields(DunningNotice)}
+        assert stub_fields.items() <= dto_fields.items()
+
     @pytest.mark.parametrize(
-        "stage,expected_keywords",
+        "cents,expected",
+        [(0, "0.00"), (250, "2.50"), (15000, "150.00"), (123456, "1234.56")],
+    )
+    def test_cents_to_euro(self, cents, expected):
+        """Test the euro formatter used by the templates."""
+        assert cents_to_euro(cents) == expected
+
+    @pytest.mark.parametrize(
+        "rendered_stage,expected_keywords",
         [
             (DunningStage.STAGE_1, ["Zahlungserinnerung", "freundlich"]),
             (DunningStage.STAGE_2, ["2. Mahnung", "7 Tagen", "weitere Maßnahmen"]),
             (DunningStage.STAGE_3, ["Letzte Mahnung", "rechtliche Schritte", "7 Tagen"]),
         ],
+        indirect=["rendered_stage"],
     )
-    def test_stage_specific_content(self, template_engine, sample_notice, stage, expected_keywords):
+    def test_stage_specific_content(self, rendered_stage, expected_keywords):
         """Test stage-specific content in templates."""
-        notice = sample_notice
-        notice.stage = stage
-
-        rendered = template_engine.render_notice(notice, stage)
+        rendered = rendered_stage
 
         # Check for stage-specific keywords
         for keyword in expected_keywords:
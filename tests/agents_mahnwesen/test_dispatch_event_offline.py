@@ -4,6 +4,7 @@ Tests the outbox event publishing and idempotency
 without external dependencies.
 """
 
+from dataclasses import replace
 from datetime import UTC, datetime, timedelta
 from unittest.mock import patch
 
@@ -13,40 +14,66 @@ from agents.mahnwesen.clients import OutboxClient
 from agents.mahnwesen.config import DunningConfig
 from agents.mahnwesen.dto import DunningChannel, DunningEvent, DunningStage
 
+_TENANT_ID = "00000000-0000-0000-0000-000000000001"
+_FIXED_NOW = datetime(2024, 1, 1, 0, 0, 0, tzinfo=UTC)
+_FIVE_DAYS = timedelta(days=5)
+
+# Constant kwargs shared by the ad-hoc events built in individual tests
+_BASE_EVENT_KWARGS = {
+    "event_id": "EVENT-TEST",
+    "tenant_id": _TENANT_ID,
+    "event_type": "DUNNING_ISSUED",
+    "invoice_id": "INV-001",
+    "notice_ref": "NOTICE-001",
+}
+
+
+@pytest.fixture(scope="module")
+def config():
+    """Create test configuration."""
+    return DunningConfig(tenant_id=_TENANT_ID)
+
+
+@pytest.fixture(scope="module")
+def outbox_client(config):
+    """Create outbox client."""
+    return OutboxClient(config)
+
+
+@pytest.fixture(scope="module")
+def sample_event():
+    """Create sample dunning event.
+
+    Shared by the whole module: tests whose code path writes to
+    event.payload (escalated/resolved) must work on a copy.
+    """
+    return DunningEvent(
+        event_id="EVENT-001",
+        tenant_id=_TENANT_ID,
+        event_type="DUNNING_ISSUED",
+        invoice_id="INV-001",
+        stage=DunningStage.STAGE_1,
+        channel=DunningChannel.EMAIL,
+        notice_ref="NOTICE-001",
+        due_date=_FIXED_NOW - _FIVE_DAYS,
+        amount_cents=15000,
+        correlation_id="CORR-001",
+        schema_version="v1",
+    )
+
+
+@pytest.fixture(scope="module")
+def sample_event_dict(sample_event):
+    """Serialize sample_event once; from_dict only reads its input."""
+    return sample_event.to_dict()
+
 
 class TestEventDispatch:
     """Test event dispatch and outbox publishing."""
 
-    @pytest.fixture
-    def config(self):
-        """Create test configuration."""
-        return DunningConfig(tenant_id="00000000-0000-0000-0000-000000000001")
-
-    @pytest.fixture
-    def outbox_client(self, config):
-        """Create outbox client."""
-        return OutboxClient(config)
-
-    @pytest.fixture
-    def sample_event(self):
-        """Create sample dunning event."""
-        return DunningEvent(
-            event_id="EVENT-001",
-            tenant_id="00000000-0000-0000-0000-000000000001",
-            event_type="DUNNING_ISSUED",
-            invoice_id="INV-001",
-            stage=DunningStage.STAGE_1,
-            channel=DunningChannel.EMAIL,
-            notice_ref="NOTICE-001",
-            due_date=datetime.now(UTC) - timedelta(days=5),
-            amount_cents=15000,
-            correlation_id="CORR-001",
-            schema_version="v1",
-        )
-
     def test_idempotency_key_generation(self, outbox_client):
         """Test idempotency key generation."""
-        tenant_id = "00000000-0000-0000-0000-000000000001"
+        tenant_id = _TENANT_ID
         invoice_id = "INV-001"
         stage = DunningStage.STAGE_1
 
@@ -55,12 +82,11 @@ class TestEventDispatch:
 
         # Should be deterministic
         assert key1 == key2
-        assert len(key1) == 64  # SHA-256 hex length
-        assert key1.isalnum()
+        assert len(bytes.fromhex(key1)) == 32  # SHA-256 hex digest (raises if not hex)
 
     def test_idempotency_key_different_inputs(self, outbox_client):
         """Test idempotency key with different inputs."""
-        tenant_id = "00000000-0000-0000-0000-000000000001"
+        tenant_id = _TENANT_ID
         invoice_id = "INV-001"
         stage = DunningStage.STAGE_1
 
@@ -115,65 +141,62 @@ class TestEventDispatch:
         assert payload_json["stage"] == sample_event.stage.value
         assert payload_json["channel"] == sample_event.channel.value
 
-    def test_publish_dunning_issued_success(self, outbox_client, sample_event):
+    @patch.object(OutboxClient, "_simulate_outbox_write")
+    def test_publish_dunning_issued_success(self, mock_write, outbox_client, sample_event):
         """Test successful dunning issued event publishing."""
-        with patch.object(outbox_client, "_simulate_outbox_write") as mock_write:
-            result = outbox_client.publish_dunning_issued(sample_event, "CORR-001")
+        result = outbox_client.publish_dunning_issued(sample_event, "CORR-001")
 
-            assert result is True
-            mock_write.assert_called_once()
+        assert result is True
+        mock_write.assert_called_once()
 
-    def test_publish_dunning_issued_failure(self, outbox_client, sample_event):
+    @patch.object(OutboxClient, "_simulate_outbox_write", side_effect=Exception("DB Error"))
+    def test_publish_dunning_issued_failure(self, mock_write, outbox_client, sample_event):
         """Test dunning issued event publishing failure."""
-        with patch.object(
-            outbox_client, "_simulate_outbox_write", side_effect=Exception("DB Error")
-        ):
-            result = outbox_client.publish_dunning_issued(sample_event, "CORR-001")
+        result = outbox_client.publish_dunning_issued(sample_event, "CORR-001")
 
-            assert result is False
+        assert result is False
 
-    def test_publish_dunning_escalated_success(self, outbox_client, sample_event):
+    @patch.object(OutboxClient, "_simulate_outbox_write")
+    def test_publish_dunning_escalated_success(self, mock_write, outbox_client, sample_event):
         """Test successful dunning escalated event publishing."""
         from_stage = DunningStage.STAGE_1
         reason = "Payment deadline exceeded"
 
-        with patch.object(outbox_client, "_simulate_outbox_write") as mock_write:
-            result = outbox_client.publish_dunning_escalated(
-                sample_event, from_stage, reason, "CORR-001"
-            )
+        event = replace(sample_event, payload={})
 
-            assert result is True
-            mock_write.assert_called_once()
+        result = outbox_client.publish_dunning_escalated(event, from_stage, reason, "CORR-001")
 
-            # Check that escalation data was added
-            call_args = mock_write.call_args[0][0]
-            payload_json = call_args["payload_json"]
-            assert payload_json["from_stage"] == from_stage.value
-            assert payload_json["reason"] == reason
-            assert "escalated_at" in payload_json
+        assert result is True
+        mock_write.assert_called_once()
 
-    def test_publish_dunning_resolved_success(self, outbox_client, sample_event):
+        # Check that escalation data was added
+        call_args = mock_write.call_args[0][0]
+        payload_json = call_args["payload_json"]
+        assert payload_json["from_stage"] == from_stage.value
+        assert payload_json["reason"] == reason
+        assert "escalated_at" in payload_json
+
+    @patch.object(OutboxClient, "_simulate_outbox_write")
+    def test_publish_dunning_resolved_success(self, mock_write, outbox_client, sample_event):
         """Test successful dunning resolved event publishing."""
         resolution = "Payment received"
-        resolved_at = datetime.now(UTC)
+        resolved_at = _FIXED_NOW
+        event = replace(sample_event, payload={})
 
-        with patch.object(outbox_client, "_simulate_outbox_write") as mock_write:
-            result = outbox_client.publish_dunning_resolved(
-                sample_event, resolution, resolved_at, "CORR-001"
-            )
+        result = outbox_client.publish_dunning_resolved(event, resolution, resolved_at, "CORR-001")
 
-            assert result is True
-            mock_write.assert_called_once()
+        assert result is True
+        mock_write.assert_called_once()
 
-            # Check that resolution data was added
-            call_args = mock_write.call_args[0][0]
-            payload_json = call_args["payload_json"]
-            assert payload_json["resolution"] == resolution
-            assert payload_json["resolved_at"] == resolved_at.isoformat()
+        # Check that resolution data was added
+        call_args = mock_write.call_args[0][0]
+        payload_json = call_args["payload_json"]
+        assert payload_json["resolution"] == resolution
+        assert payload_json["resolved_at"] == resolved_at.isoformat()
 
     def test_check_duplicate_event(self, outbox_client):
         """Test duplicate event checking."""
-        tenant_id = "00000000-0000-0000-0000-000000000001"
+        tenant_id = _TENANT_ID
         invoice_id = "INV-001"
         stage = DunningStage.STAGE_1
 
@@ -197,9 +220,9 @@ class TestEventDispatch:
         # Check amount formatting
         assert payload["amount"] == "150.00"  # 15000 cents / 100
 
-    def test_event_serialization(self, sample_event):
+    def test_event_serialization(self, sample_event, sample_event_dict):
         """Test event serialization to dictionary."""
-        data = sample_event.to_dict()
+        data = sample_event_dict
 
         # Check all fields are present
         assert data["event_id"] == sample_event.event_id
@@ -213,12 +236,10 @@ class TestEventDispatch:
         assert data["correlation_id"] == sample_event.correlation_id
         assert data["schema_version"] == sample_event.schema_version
 
-    def test_event_deserialization(self, sample_event):
+    def test_event_deserialization(self, sample_event, sample_event_dict):
         """Test event deserialization from dictionary."""
-        data = sample_event.to_dict()
-
         # Create new event from data
-        new_event = DunningEvent.from_dict(data)
+        new_event = DunningEvent.from_dict(sample_event_dict)
 
         # Check all fields match
         assert new_event.event_id == sample_event.event_id
@@ -238,13 +259,9 @@ class TestEventDispatch:
 
         for event_type in event_types:
             event = DunningEvent(
-                event_id="EVENT-TEST",
-                tenant_id="00000000-0000-0000-0000-000000000001",
-                event_type=event_type,
-                invoice_id="INV-001",
+                **{**_BASE_EVENT_KWARGS, "event_type": event_type},
                 stage=DunningStage.STAGE_1,
                 channel=DunningChannel.EMAIL,
-                notice_ref="NOTICE-001",
             )
 
             assert event.event_type == event_type
@@ -253,13 +270,9 @@ class TestEventDispatch:
     def test_schema_version_handling(self):
         """Test schema version handling."""
         event = DunningEvent(
-            event_id="EVENT-TEST",
-            tenant_id="00000000-0000-0000-0000-000000000001",
-            event_type="DUNNING_ISSUED",
-            invoice_id="INV-001",
+            **_BASE_EVENT_KWARGS,
             stage=DunningStage.STAGE_1,
             channel=DunningChannel.EMAIL,
-            notice_ref="NOTICE-001",
             schema_version="v2",
         )
 
@@ -269,13 +282,9 @@ class TestEventDispatch:
     def test_correlation_id_handling(self):
         """Test correlation ID handling."""
         event = DunningEvent(
-            event_id="EVENT-TEST",
-            tenant_id="00000000-0000-0000-0000-000000000001",
-            event_type="DUNNING_ISSUED",
-            invoice_id="INV-001",
+            **_BASE_EVENT_KWARGS,
             stage=DunningStage.STAGE_1,
             channel=DunningChannel.EMAIL,
-            notice_ref="NOTICE-001",
             correlation_id="CORR-TEST-123",
         )
 
@@ -287,13 +296,9 @@ class TestEventDispatch:
         custom_payload = {"custom_field": "custom_value", "metadata": {"key": "value"}}
 
         event = DunningEvent(
-            event_id="EVENT-TEST",
-            tenant_id="00000000-0000-0000-0000-000000000001",
-            event_type="DUNNING_ISSUED",
-            invoice_id="INV-001",
+            **_BASE_EVENT_KWARGS,
             stage=DunningStage.STAGE_1,
             channel=DunningChannel.EMAIL,
-            notice_ref="NOTICE-001",
             payload=custom_payload,
         )
 
@@ -301,47 +306,18 @@ class TestEventDispatch:
         assert event.to_dict()["payload"] == custom_payload
 
     @pytest.mark.parametrize(
-        "stage,expected_stage_value",
+        "stage,channel,stage_val,channel_val",
         [
-            (DunningStage.STAGE_1, 1),
-            (DunningStage.STAGE_2, 2),
-            (DunningStage.STAGE_3, 3),
+            (DunningStage.STAGE_1, DunningChannel.EMAIL, 1, "email"),
+            (DunningStage.STAGE_2, DunningChannel.LETTER, 2, "letter"),
+            (DunningStage.STAGE_3, DunningChannel.SMS, 3, "sms"),
         ],
     )
-    def test_stage_serialization(self, stage, expected_stage_value):
-        """Test stage serialization."""
-        event = DunningEvent(
-            event_id="EVENT-TEST",
-            tenant_id="00000000-0000-0000-0000-000000000001",
-            event_type="DUNNING_ISSUED",
-            invoice_id="INV-001",
-            stage=stage,
-            channel=DunningChannel.EMAIL,
-            notice_ref="NOTICE-001",
-        )
-
-        assert event.to_dict()["stage"] == expected_stage_value
-        assert event.to_outbox_payload()["stage"] == expected_stage_value
-
-    @pytest.mark.parametrize(
-        "channel,expected_channel_value",
-        [
-            (DunningChannel.EMAIL, "email"),
-            (DunningChannel.LETTER, "letter"),
-            (DunningChannel.SMS, "sms"),
-        ],
-    )
-    def test_channel_serialization(self, channel, expected_channel_value):
-        """Test channel serialization."""
-        event = DunningEvent(
-            event_id="EVENT-TEST",
-            tenant_id="00000000-0000-0000-0000-000000000001",
-            event_type="DUNNING_ISSUED",
-            invoice_id="INV-001",
-            stage=DunningStage.STAGE_1,
-            channel=channel,
-            notice_ref="NOTICE-001",
-        )
-
-        assert event.to_dict()["channel"] == expected_channel_value
-        assert event.to_outbox_payload()["channel"] == expected_channel_value
+    def test_stage_channel_serialization(self, stage, channel, stage_val, channel_val):
+        """Test stage and channel serialization."""
+        event = DunningEvent(**_BASE_EVENT_KWARGS, stage=stage, channel=channel)
+
+        data = event.to_dict()
+        payload = event.to_outbox_payload()
+        assert (data["stage"], data["channel"]) == (stage_val, channel_val)
+        assert (payload["stage"], payload["channel"]) == (stage_val, channel_val)
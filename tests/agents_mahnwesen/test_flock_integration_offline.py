@@ -4,77 +4,194 @@ Tests the Flock-based workflow orchestration
 without external dependencies.
 """
 
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
-from unittest.mock import Mock, patch
+from typing import NamedTuple
 
 import pytest
 
+from agents.mahnwesen.approval_store import ApprovalStore
 from agents.mahnwesen.config import DunningConfig
-from agents.mahnwesen.dto import DunningChannel, DunningStage
+from agents.mahnwesen.dto import DunningChannel, DunningNotice, DunningStage
 from agents.mahnwesen.playbooks import DunningContext, DunningPlaybook
 from agents.mahnwesen.policies import OverdueInvoice
 
+pytestmark = pytest.mark.offline
+
+
+class OverduePage(NamedTuple):
+    """Read-only stand-in for OverdueInvoicesResponse."""
+
+    invoices: list[OverdueInvoice]
+    next_cursor: str | None
+    total_count: int
+    has_more: bool
+
+
+@dataclass
+class FakeReadClient:
+    """In-memory stand-in for ReadApiClient returning a fixed page."""
+
+    invoices: list = field(default_factory=list)
+    next_cursor: str | None = None
+    total_count: int | None = None
+    has_more: bool = False
+    error: Exception | None = None
+
+    def get_overdue_invoices(self, *args, **kwargs):
+        if self.error is not None:
+            raise self.error
+        return OverduePage(
+            self.invoices,
+            self.next_cursor,
+            len(self.invoices) if self.total_count is None else self.total_count,
+            self.has_more,
+        )
+
+
+@dataclass
+class FakeOutboxClient:
+    """In-memory stand-in for OutboxClient with configurable outcomes."""
+
+    duplicate: bool = False
+    publish_ok: bool = True
+    published: list = field(default_factory=list)
+
+    def check_duplicate_event(self, tenant_id, invoice_id, stage) -> bool:
+        return self.duplicate
+
+    def publish_dunning_issued(self, event, correlation_id=None, dry_run=False) -> bool:
+        self.published.append(event)
+        return self.publish_ok
+
+
+def happy_path(ctx, invoices, *, duplicate=False, publish_ok=True, **page):
+    """Configure the context's fake clients for a run_once over ``invoices``.
+
+    Extra keyword arguments override the returned page (cursor, total_count, ...).
+    """
+    ctx.read_client.invoices = invoices
+    for name, value in page.items():
+        setattr(ctx.read_client, name, value)
+    ctx.outbox_client.duplicate = duplicate
+    ctx.outbox_client.publish_ok = publish_ok
+
+
+# Captured once per module: the playbook stages invoices against the wall clock,
+# so due dates must stay relative to "now" rather than a fixed calendar date.
+_NOW = datetime.now(UTC)
+_FIVE_DAYS = timedelta(days=5)
+_TWENTY_DAYS = timedelta(days=20)
+_THIRTY_FIVE_DAYS = timedelta(days=35)
+
+
+@pytest.fixture(scope="module")
+def config():
+    """Create test configuration."""
+    return DunningConfig(
+        tenant_id="00000000-0000-0000-0000-000000000001",
+        stage_1_threshold=3,
+        stage_2_threshold=14,
+        stage_3_threshold=30,
+        min_amount_cents=100,
+        grace_days=0,
+    )
+
+
+@pytest.fixture(scope="module")
+def playbook(config):
+    """Create test playbook."""
+    return DunningPlaybook(config)
+
+
+@pytest.fixture(scope="module")
+def sample_invoices():
+    """Create sample overdue invoices (shared read-only across the module)."""
+    return [
+        OverdueInvoice(
+            invoice_id="INV-001",
+            tenant_id="00000000-0000-0000-0000-000000000001",
+            invoice_number="2024-001",
+            due_date=_NOW - _FIVE_DAYS,
+            amount_cents=15000,
+            customer_email="customer1@example.com",
+            customer_name="Customer 1",
+        ),
+        OverdueInvoice(
+            invoice_id="INV-002",
+            tenant_id="00000000-0000-0000-0000-000000000001",
+            invoice_number="2024-002",
+            due_date=_NOW - _TWENTY_DAYS,
+            amount_cents=25000,
+            customer_email="customer2@example.com",
+            customer_name="Customer 2",
+        ),
+        OverdueInvoice(
+            invoice_id="INV-003",
+            tenant_id="00000000-0000-0000-0000-000000000001",
+            invoice_number="2024-003",
+            due_date=_NOW - _THIRTY_FIVE_DAYS,
+            amount_cents=35000,
+            customer_email="customer3@example.com",
+            customer_name="Customer 3",
+        ),
+    ]
+
+
+@pytest.fixture(scope="module")
+def stage_groups(sample_invoices):
+    """Group sample_invoices by dunning stage as the scan task would."""
+    return {
+        DunningStage.STAGE_1: [sample_invoices[0]],
+        DunningStage.STAGE_2: [sample_invoices[1]],
+        DunningStage.STAGE_3: [sample_invoices[2]],
+    }
+
 
 class TestFlockIntegration:
     """Test Flock-based workflow integration."""
 
     @pytest.fixture
-    def config(self):
-        """Create test configuration."""
-        return DunningConfig(
-            tenant_id="00000000-0000-0000-0000-000000000001",
-            stage_1_threshold=3,
-            stage_2_threshold=14,
-            stage_3_threshold=30,
-            min_amount_cents=100,
-            grace_days=0,
-        )
+    def read_client(self):
+        """Create fake read client (per test, tests set its state)."""
+        return FakeReadClient()
+
+    @pytest.fixture
+    def outbox_client(self, request):
+        """Create fake outbox client; indirect params set its outcomes."""
+        return FakeOutboxClient(**getattr(request, "param", {}))
 
     @pytest.fixture
-    def context(self, config):
+    def context(self, config, read_client, outbox_client, tmp_path):
         """Create test context."""
         return DunningContext(
-            tenant_id=config.tenant_id, correlation_id="TEST-CORR-001", dry_run=True, limit=10
+            tenant_id=config.tenant_id,
+            correlation_id="TEST-CORR-001",
+            dry_run=True,
+            limit=10,
+            read_client=read_client,
+            outbox_client=outbox_client,
+            approval_store=ApprovalStore(base_path=tmp_path),
         )
 
     @pytest.fixture
-    def playbook(self, config):
-        """Create test playbook."""
-        return DunningPlaybook(config)
+    def make_notice(self, context):
+        """Return a factory for DunningNotice instances bound to the test tenant."""
 
-    @pytest.fixture
-    def sample_invoices(self):
-        """Create sample overdue invoices."""
-        now = datetime.now(UTC)
-        return [
-            OverdueInvoice(
-                invoice_id="INV-001",
-                tenant_id="00000000-0000-0000-0000-000000000001",
-                invoice_number="2024-001",
-                due_date=now - timedelta(days=5),
-                amount_cents=15000,
-                customer_email="customer1@example.com",
-                customer_name="Customer 1",
-            ),
-            OverdueInvoice(
-                invoice_id="INV-002",
-                tenant_id="00000000-0000-0000-0000-000000000001",
-                invoice_number="2024-002",
-                due_date=now - timedelta(days=20),
-                amount_cents=25000,
-                customer_email="customer2@example.com",
-                customer_name="Customer 2",
-            ),
-            OverdueInvoice(
-                invoice_id="INV-003",
-                tenant_id="00000000-0000-0000-0000-000000000001",
-                invoice_number="2024-003",
-                due_date=now - timedelta(days=35),
-                amount_cents=35000,
-                customer_email="customer3@example.com",
-                customer_name="Customer 3",
-            ),
-        ]
+        def _make(idx=1, stage=DunningStage.STAGE_1, amount=15000, fee=250, **extra):
+            return DunningNotice(
+                notice_id=f"NOTICE-{idx:03d}",
+                tenant_id=context.tenant_id,
+                invoice_id=f"INV-{idx:03d}",
+                stage=stage,
+                channel=DunningChannel.EMAIL,
+                amount_cents=amount,
+                dunning_fee_cents=fee,
+                total_amount_cents=amount + fee,
+                **extra,
+            )
+
+        return _make
 
     def test_flock_flow_creation(self, playbook, context):
         """Test Flock flow creation."""
@@ -83,167 +200,85 @@ class TestFlockIntegration:
         # Check flow properties
         assert flow.name == "dunning_processing"
         assert flow.description == "Automated dunning process for overdue invoices"
-        assert hasattr(flow, "add_task")
+        assert callable(flow.add_task)
 
-    def test_scan_overdue_invoices_task(self, playbook, context, sample_invoices):
+    def test_scan_overdue_invoices_task(self, playbook, context, read_client, sample_invoices):
         """Test scan overdue invoices task."""
-        # Mock read client
-        with patch.object(context.read_client, "get_overdue_invoices") as mock_get:
-            mock_get.return_value = Mock(
-                invoices=sample_invoices,
-                next_cursor=None,
-                total_count=len(sample_invoices),
-                has_more=False,
-            )
+        read_client.invoices = sample_invoices
+
+        result = playbook._scan_overdue_invoices(context)
 
-            result = playbook._scan_overdue_invoices(context)
-
-            # Check result structure
-            assert "total_found" in result
-            assert "eligible_count" in result
-            assert "stage_1_count" in result
-            assert "stage_2_count" in result
-            assert "stage_3_count" in result
-            assert "invoices" in result
-            assert "stage_groups" in result
-
-            # Check counts
-            assert result["total_found"] == len(sample_invoices)
-            assert result["eligible_count"] == len(sample_invoices)
-            assert result["stage_1_count"] == 1
-            assert result["stage_2_count"] == 1
-            assert result["stage_3_count"] == 1
-
-    def test_compose_dunning_notices_task(self, playbook, context, sample_invoices):
+        # Check result structure
+        assert {
+            "total_found",
+            "eligible_count",
+            "stage_1_count",
+            "stage_2_count",
+            "stage_3_count",
+            "invoices",
+            "stage_groups",
+        } <= result.keys()
+
+        # Check counts
+        assert result["total_found"] == len(sample_invoices)
+        assert result["eligible_count"] == len(sample_invoices)
+        assert result["stage_1_count"] == 1
+        assert result["stage_2_count"] == 1
+        assert result["stage_3_count"] == 1
+
+    def test_compose_dunning_notices_task(self, playbook, context, stage_groups):
         """Test compose dunning notices task."""
         # Setup context with scan results
-        context.kwargs = {
-            "scan_results": {
-                "stage_groups": {
-                    DunningStage.STAGE_1: [sample_invoices[0]],
-                    DunningStage.STAGE_2: [sample_invoices[1]],
-                    DunningStage.STAGE_3: [sample_invoices[2]],
-                }
-            }
-        }
+        context.kwargs = {"scan_results": {"stage_groups": stage_groups}}
 
         result = playbook._compose_dunning_notices(context)
 
         # Check result structure
-        assert "notices_created" in result
-        assert "notices" in result
+        assert {"notices_created", "notices"} <= result.keys()
 
         # Check notice creation
         assert result["notices_created"] == 3
         assert len(result["notices"]) == 3
 
         # Check notice properties
+        valid_ids = frozenset({"INV-001", "INV-002", "INV-003"})
+        valid_stages = frozenset(stage_groups)
         for notice in result["notices"]:
             assert notice.tenant_id == context.tenant_id
-            assert notice.invoice_id in ["INV-001", "INV-002", "INV-003"]
-            assert notice.stage in [
-                DunningStage.STAGE_1,
-                DunningStage.STAGE_2,
-                DunningStage.STAGE_3,
-            ]
+            assert notice.invoice_id in valid_ids
+            assert notice.stage in valid_stages
             assert notice.content  # Should have rendered content
             assert notice.subject  # Should have subject
 
-    def test_dispatch_dunning_events_task(self, playbook, context):
-        """Test dispatch dunning events task."""
-        from agents.mahnwesen.dto import DunningNotice
-
-        # Create sample notices
+    @pytest.mark.parametrize(
+        "outbox_client, total, dispatched",
+        [
+            ({}, 2, 2),
+            ({"duplicate": True}, 1, 0),  # duplicates are skipped
+            # In dry-run mode, events are counted as dispatched but not actually sent
+            ({"publish_ok": False}, 1, 1),
+        ],
+        ids=["ok", "duplicate", "publish_failure"],
+        indirect=["outbox_client"],
+    )
+    def test_dispatch_events(self, playbook, context, make_notice, total, dispatched):
+        """Test dispatch dunning events task against duplicate/publish outcomes."""
         notices = [
-            DunningNotice(
-                notice_id="NOTICE-001",
-                tenant_id=context.tenant_id,
-                invoice_id="INV-001",
-                stage=DunningStage.STAGE_1,
-                channel=DunningChannel.EMAIL,
-                amount_cents=15000,
-                dunning_fee_cents=250,
-                total_amount_cents=15250,
-            ),
-            DunningNotice(
-                notice_id="NOTICE-002",
-                tenant_id=context.tenant_id,
-                invoice_id="INV-002",
-                stage=DunningStage.STAGE_2,
-                channel=DunningChannel.EMAIL,
-                amount_cents=25000,
-                dunning_fee_cents=500,
-                total_amount_cents=25500,
-            ),
+            make_notice(i, DunningStage(i), amount, fee)
+            for i, amount, fee in [(1, 15000, 250), (2, 25000, 500)][:total]
         ]
 
         # Setup context with compose results
         context.kwargs = {"compose_results": {"notices": notices}}
 
-        # Mock outbox client
-        with patch.object(context.outbox_client, "check_duplicate_event", return_value=False):
-            with patch.object(context.outbox_client, "publish_dunning_issued", return_value=True):
-                result = playbook._dispatch_dunning_events(context)
-
-                # Check result structure
-                assert "events_dispatched" in result
-                assert "total_events" in result
-
-                # Check dispatch results
-                assert result["total_events"] == 2
-                assert result["events_dispatched"] == 2
-
-    def test_dispatch_with_duplicates(self, playbook, context):
-        """Test dispatch with duplicate events."""
-        from agents.mahnwesen.dto import DunningNotice
-
-        # Create sample notice
-        notice = DunningNotice(
-            notice_id="NOTICE-001",
-            tenant_id=context.tenant_id,
-            invoice_id="INV-001",
-            stage=DunningStage.STAGE_1,
-            channel=DunningChannel.EMAIL,
-            amount_cents=15000,
-        )
-
-        # Setup context with compose results
-        context.kwargs = {"compose_results": {"notices": [notice]}}
-
-        # Mock duplicate check
-        with patch.object(context.outbox_client, "check_duplicate_event", return_value=True):
-            result = playbook._dispatch_dunning_events(context)
-
-            # Should skip duplicate events
-            assert result["total_events"] == 1
-            assert result["events_dispatched"] == 0
+        result = playbook._dispatch_dunning_events(context)
 
-    def test_dispatch_with_failures(self, playbook, context):
-        """Test dispatch with publishing failures."""
-        from agents.mahnwesen.dto import DunningNotice
-
-        # Create sample notice
-        notice = DunningNotice(
-            notice_id="NOTICE-001",
-            tenant_id=context.tenant_id,
-            invoice_id="INV-001",
-            stage=DunningStage.STAGE_1,
-            channel=DunningChannel.EMAIL,
-            amount_cents=15000,
-        )
-
-        # Setup context with compose results
-        context.kwargs = {"compose_results": {"notices": [notice]}}
-
-        # Mock publishing failure
-        with patch.object(context.outbox_client, "check_duplicate_event", return_value=False):
-            with patch.object(context.outbox_client, "publish_dunning_issued", return_value=False):
-                result = playbook._dispatch_dunning_events(context)
+        # Check result structure
+        assert {"events_dispatched", "total_events"} <= result.keys()
 
-                # Should report failure
-                assert result["total_events"] == 1
-                # In dry-run mode, events are counted as dispatched but not actually sent
-                assert result["events_dispatched"] == 1
+        # Check dispatch results
+        assert result["total_events"] == total
+        assert result["events_dispatched"] == dispatched
 
     def test_create_notice(self, playbook, context, sample_invoices):
         """Test notice creation from invoice."""
@@ -262,20 +297,9 @@ class TestFlockIntegration:
         assert notice.dunning_fee_cents == 250  # Stage 1 fee
         assert notice.total_amount_cents == invoice.amount_cents + 250
 
-    def test_create_dunning_event(self, playbook, context):
+    def test_create_dunning_event(self, playbook, context, make_notice):
         """Test dunning event creation from notice."""
-        from agents.mahnwesen.dto import DunningNotice
-
-        notice = DunningNotice(
-            notice_id="NOTICE-001",
-            tenant_id=context.tenant_id,
-            invoice_id="INV-001",
-            stage=DunningStage.STAGE_1,
-            channel=DunningChannel.EMAIL,
-            notice_ref="NOTICE-001",
-            due_date=datetime.now(UTC) - timedelta(days=5),
-            amount_cents=15000,
-        )
+        notice = make_notice(notice_ref="NOTICE-001", due_date=_NOW - _FIVE_DAYS)
 
         event = playbook._create_dunning_event(notice, context)
 
@@ -290,96 +314,53 @@ class TestFlockIntegration:
         assert event.correlation_id == context.correlation_id
         assert event.schema_version == "v1"
 
-    def test_run_once_success(self, playbook, context, sample_invoices):
-        """Test successful run_once execution."""
-        # Mock all dependencies
-        with patch.object(context.read_client, "get_overdue_invoices") as mock_get:
-            mock_get.return_value = Mock(
-                invoices=sample_invoices,
-                next_cursor=None,
-                total_count=len(sample_invoices),
-                has_more=False,
-            )
-
-            with patch.object(context.outbox_client, "check_duplicate_event", return_value=False):
-                with patch.object(
-                    context.outbox_client, "publish_dunning_issued", return_value=True
-                ):
-                    result = playbook.run_once(context)
-
-                    # Check result
-                    assert result.success is True
-                    assert result.notices_created == 3
-                    prepared = result.metadata.get("dry_run_prepared", [])
-                    blocked = result.metadata.get("blocked_without_approval", [])
-                    assert result.events_dispatched == len(prepared)
-                    assert len(prepared) == 0
-                    assert len(blocked) == 3
-                    assert result.processing_time_seconds > 0
-                    assert len(result.errors) == 0
-
-    def test_run_once_failure(self, playbook, context):
-        """Test run_once execution failure."""
-        # Mock API failure
-        with patch.object(
-            context.read_client, "get_overdue_invoices", side_effect=Exception("API Error")
-        ):
-            result = playbook.run_once(context)
-
-            # Check result
-            assert result.success is False
-            assert len(result.errors) > 0
-            assert "API Error" in result.errors[0]
-
-    def test_dry_run_mode(self, playbook, context, sample_invoices):
-        """Test dry run mode."""
-        context.dry_run = True
-
-        # Mock dependencies
-        with patch.object(context.read_client, "get_overdue_invoices") as mock_get:
-            mock_get.return_value = Mock(
-                invoices=sample_invoices,
-                next_cursor=None,
-                total_count=len(sample_invoices),
-                has_more=False,
-            )
-
-            result = playbook.run_once(context)
-
-            # Should succeed in dry run mode
-            assert result.success is True
-            assert result.notices_created == 3
-            prepared = result.metadata.get("dry_run_prepared", [])
-            blocked = result.metadata.get("blocked_without_approval", [])
-            # In dry run, only stages without approval requirements dispatch
-            assert result.events_dispatched == len(prepared)
-            assert len(prepared) == 0
-            assert len(blocked) == 3
-
-    def test_template_engine_integration(self, context):
+    @pytest.mark.parametrize("dry_run", [True, False], ids=["dry_run", "live"])
+    def test_run_once_success(self, playbook, context, sample_invoices, dry_run):
+        """Test successful run_once execution with and without dry run."""
+        context.dry_run = dry_run
+        happy_path(context, sample_invoices)
+
+        result = playbook.run_once(context)
+
+        # Check result
+        assert result.success is True
+        assert result.notices_created == 3
+        prepared = result.metadata.get("dry_run_prepared", [])
+        blocked = result.metadata.get("blocked_without_approval", [])
+        # Every stage requires approval, so nothing is dispatched either way
+        assert result.events_dispatched == len(prepared)
+        assert len(prepared) == 0
+        assert len(blocked) == 3
+        assert result.processing_time_seconds > 0
+        assert len(result.errors) == 0
+
+    @pytest.mark.parametrize("msg", ["API Error", "Network error"])
+    def test_run_once_error(self, playbook, context, read_client, msg):
+        """Test run_once handles read API failures gracefully."""
+        read_client.error = Exception(msg)
+
+        result = playbook.run_once(context)
+
+        # Check result
+        assert result.success is False
+        assert len(result.errors) > 0
+        assert msg in result.errors[0]
+
+    def test_template_engine_integration(self, context, make_notice):
         """Test template engine integration."""
-        from agents.mahnwesen.dto import DunningNotice
-
-        notice = DunningNotice(
-            notice_id="NOTICE-001",
-            tenant_id=context.tenant_id,
-            invoice_id="INV-001",
-            stage=DunningStage.STAGE_1,
-            channel=DunningChannel.EMAIL,
-            amount_cents=15000,
-            dunning_fee_cents=250,
-            total_amount_cents=15250,
-        )
+        notice = make_notice()
 
         # Test template rendering
         rendered = context.template_engine.render_notice(notice, DunningStage.STAGE_1)
 
         # Check rendered content
-        assert rendered.content
+        content = rendered.content
+        assert content
         assert rendered.subject
-        assert "Zahlungserinnerung" in rendered.content
-        assert notice.invoice_id in rendered.content
-        assert "150.00" in rendered.content
+        missing = [
+            tok for tok in ("Zahlungserinnerung", notice.invoice_id, "150.00") if tok not in content
+        ]
+        assert not missing, missing
 
     def test_context_initialization(self, config):
         """Test context initialization."""
@@ -400,78 +381,55 @@ class TestFlockIntegration:
 
     def test_workflow_trace(self, playbook, context, sample_invoices):
         """Test workflow trace and observability."""
-        # Mock dependencies
-        with patch.object(context.read_client, "get_overdue_invoices") as mock_get:
-            mock_get.return_value = Mock(
-                invoices=sample_invoices,
-                next_cursor=None,
-                total_count=len(sample_invoices),
-                has_more=False,
-            )
+        happy_path(context, sample_invoices)
 
-            with patch.object(context.outbox_client, "check_duplicate_event", return_value=False):
-                with patch.object(
-                    context.outbox_client, "publish_dunning_issued", return_value=True
-                ):
-                    result = playbook.run_once(context)
-
-                    # Check trace information
-                    assert result.success is True
-                    assert result.processing_time_seconds > 0
-                    assert result.notices_created > 0
-                    prepared = result.metadata.get("dry_run_prepared", [])
-                    blocked = result.metadata.get("blocked_without_approval", [])
-                    assert result.events_dispatched == len(prepared)
-                    assert len(prepared) == 0
-                    assert len(blocked) == 3
-
-    def test_error_handling(self, playbook, context):
-        """Test error handling in workflow."""
-        # Mock API error
-        with patch.object(
-            context.read_client, "get_overdue_invoices", side_effect=Exception("Network error")
-        ):
-            result = playbook.run_once(context)
-
-            # Should handle error gracefully
-            assert result.success is False
-            assert len(result.errors) > 0
-            assert "Network error" in result.errors[0]
+        result = playbook.run_once(context)
+
+        # Check trace information
+        assert result.success is True
+        assert result.processing_time_seconds > 0
+        assert result.notices_created > 0
+        prepared = result.metadata.get("dry_run_prepared", [])
+        blocked = result.metadata.get("blocked_without_approval", [])
+        assert result.events_dispatched == len(prepared)
+        assert len(prepared) == 0
+        assert len(blocked) == 3
+
+    def test_invoice_is_slotted(self, sample_invoices):
+        """Guard slots=True on OverdueInvoice; bulk pagination tests build many of them."""
+        assert not hasattr(sample_invoices[0], "__dict__")
 
     def test_limit_handling(self, playbook, context):
         """Test limit handling in workflow."""
         context.limit = 2
 
         # Create more invoices than limit
+        due = _NOW - _FIVE_DAYS
         many_invoices = [
             OverdueInvoice(
                 invoice_id=f"INV-{i:03d}",
                 tenant_id=context.tenant_id,
                 invoice_number=f"2024-{i:03d}",
-                due_date=datetime.now(UTC) - timedelta(days=5),
+                due_date=due,
                 amount_cents=15000,
             )
             for i in range(5)
         ]
 
-        # Mock API with limit
-        with patch.object(context.read_client, "get_overdue_invoices") as mock_get:
-            mock_get.return_value = Mock(
-                invoices=many_invoices[: context.limit],
-                next_cursor="next-cursor",
-                total_count=len(many_invoices),
-                has_more=True,
-            )
+        # API returns one page of `limit` invoices
+        happy_path(
+            context,
+            many_invoices[: context.limit],
+            next_cursor="next-cursor",
+            total_count=len(many_invoices),
+            has_more=True,
+        )
+
+        result = playbook.run_once(context)
 
-            with patch.object(context.outbox_client, "check_duplicate_event", return_value=False):
-                with patch.object(
-                    context.outbox_client, "publish_dunning_issued", return_value=True
-                ):
-                    result = playbook.run_once(context)
-
-                    # Should respect limit
-                    assert result.success is True
-                    assert result.notices_created == context.limit
-                    prepared = result.metadata.get("dry_run_prepared", [])
-                    assert result.events_dispatched == len(prepared)
-                    assert len(prepared) == 0
+        # Should respect limit
+        assert result.success is True
+        assert result.notices_created == context.limit
+        prepared = result.metadata.get("dry_run_prepared", [])
+        assert result.events_dispatched == len(prepared)
+        assert len(prepared) == 0
@@ -10,28 +10,72 @@ from unittest.mock import Mock, patch
 
 import pytest
 
+from agents.mahnwesen.clients import OverdueInvoicesResponse
 from agents.mahnwesen.config import DunningConfig
 from agents.mahnwesen.dto import DunningStage
 from agents.mahnwesen.playbooks import DunningContext, DunningPlaybook
 from agents.mahnwesen.policies import OverdueInvoice
 
+pytestmark = pytest.mark.skipif(
+    os.getenv("RUN_DB_TESTS") != "1",
+    reason="Database tests disabled (set RUN_DB_TESTS=1 to enable)",
+)
+
+# Captured once per module: run_once stages invoices against the wall clock, so
+# a fixed calendar date would push every sample invoice into stage 3.
+_NOW = datetime.now(UTC)
+
+_SAMPLE_INVOICES = (
+    OverdueInvoice(
+        invoice_id="INV-SMOKE-001",
+        tenant_id="00000000-0000-0000-0000-000000000001",
+        invoice_number="2024-SMOKE-001",
+        due_date=_NOW - timedelta(days=5),
+        amount_cents=15000,
+        customer_email="smoke1@example.com",
+        customer_name="Smoke Customer 1",
+    ),
+    OverdueInvoice(
+        invoice_id="INV-SMOKE-002",
+        tenant_id="00000000-0000-0000-0000-000000000001",
+        invoice_number="2024-SMOKE-002",
+        due_date=_NOW - timedelta(days=20),
+        amount_cents=25000,
+        customer_email="smoke2@example.com",
+        customer_name="Smoke Customer 2",
+    ),
+)
+
+
+@pytest.fixture(scope="module")
+def config():
+    """Create test configuration."""
+    return DunningConfig(
+        tenant_id="00000000-0000-0000-0000-000000000001",
+        stage_1_threshold=3,
+        stage_2_threshold=14,
+        stage_3_threshold=30,
+        min_amount_cents=100,
+        grace_days=0,
+        read_api_base_url="http://localhost:8000",
+    )
+
+
+@pytest.fixture(scope="module")
+def playbook(config):
+    """Create test playbook."""
+    return DunningPlaybook(config)
+
+
+@pytest.fixture(scope="module")
+def sample_invoices():
+    """Return the shared sample overdue invoices (read-only)."""
+    return _SAMPLE_INVOICES
+
 
 class TestFlowSmokeLocalDB:
     """Smoke test for complete dunning flow with database."""
 
-    @pytest.fixture
-    def config(self):
-        """Create test configuration."""
-        return DunningConfig(
-            tenant_id="00000000-0000-0000-0000-000000000001",
-            stage_1_threshold=3,
-            stage_2_threshold=14,
-            stage_3_threshold=30,
-            min_amount_cents=100,
-            grace_days=0,
-            read_api_base_url="http://localhost:8000",
-        )
-
     @pytest.fixture
     def context(self, config):
         """Create test context."""
@@ -39,91 +83,44 @@ class TestFlowSmokeLocalDB:
             tenant_id=config.tenant_id, correlation_id="SMOKE-TEST-001", dry_run=True, limit=5
         )
 
-    @pytest.fixture
-    def playbook(self, config):
-        """Create test playbook."""
-        return DunningPlaybook(config)
-
-    @pytest.fixture
-    def sample_invoices(self):
-        """Create sample overdue invoices."""
-        now = datetime.now(UTC)
-        return [
-            OverdueInvoice(
-                invoice_id="INV-SMOKE-001",
-                tenant_id="00000000-0000-0000-0000-000000000001",
-                invoice_number="2024-SMOKE-001",
-                due_date=now - timedelta(days=5),
-                amount_cents=15000,
-                customer_email="smoke1@example.com",
-                customer_name="Smoke Customer 1",
-            ),
-            OverdueInvoice(
-                invoice_id="INV-SMOKE-002",
-                tenant_id="00000000-0000-0000-0000-000000000001",
-                invoice_number="2024-SMOKE-002",
-                due_date=now - timedelta(days=20),
-                amount_cents=25000,
-                customer_email="smoke2@example.com",
-                customer_name="Smoke Customer 2",
-            ),
-        ]
-
-    @pytest.mark.skipif(
-        os.getenv("RUN_DB_TESTS") != "1",
-        reason="Database tests disabled (set RUN_DB_TESTS=1 to enable)",
-    )
     def test_complete_flow_with_db(self, playbook, context, sample_invoices):
         """Test complete flow with database integration."""
-        # Mock database responses
-        with patch.object(context.read_client, "get_overdue_invoices") as mock_get:
-            mock_get.return_value = Mock(
-                invoices=sample_invoices,
-                next_cursor=None,
-                total_count=len(sample_invoices),
-                has_more=False,
-            )
+        page = OverdueInvoicesResponse(
+            invoices=sample_invoices,
+            next_cursor=None,
+            total_count=len(sample_invoices),
+            has_more=False,
+        )
 
-            # Mock outbox operations
-            with patch.object(context.outbox_client, "check_duplicate_event", return_value=False):
-                with patch.object(
-                    context.outbox_client, "publish_dunning_issued", return_value=True
-                ):
-                    result = playbook.run_once(context)
-
-                    # Check successful execution
-                    assert result.success is True
-                    assert result.notices_created == 2
-                    assert result.events_dispatched == 2
-                    assert result.processing_time_seconds > 0
-                    assert len(result.errors) == 0
-
-    @pytest.mark.skipif(
-        os.getenv("RUN_DB_TESTS") != "1",
-        reason="Database tests disabled (set RUN_DB_TESTS=1 to enable)",
-    )
-    def test_database_health_check(self, context):
-        """Test database health check."""
-        # Mock health check
-        with patch.object(context.read_client, "health_check", return_value=True):
-            is_healthy = context.read_client.health_check()
-            assert is_healthy is True
-
-    @pytest.mark.skipif(
-        os.getenv("RUN_DB_TESTS") != "1",
-        reason="Database tests disabled (set RUN_DB_TESTS=1 to enable)",
-    )
-    def test_database_connection_failure(self, context):
-        """Test database connection failure handling."""
-        # Mock connection failure
-        with patch.object(context.read_client, "health_check", return_value=False):
-            is_healthy = context.read_client.health_check()
-            assert is_healthy is False
-
-    @pytest.mark.skipif(
-        os.getenv("RUN_DB_TESTS") != "1",
-        reason="Database tests disabled (set RUN_DB_TESTS=1 to enable)",
+        # Mock database responses and outbox operations
+        with (
+            patch.object(context.read_client, "get_overdue_invoices", return_value=page),
+            patch.multiple(
+                context.outbox_client,
+                check_duplicate_event=Mock(return_value=False),
+                publish_dunning_issued=Mock(return_value=True),
+            ),
+        ):
+            result = playbook.run_once(context)
+
+        # Check successful execution
+        assert result.success is True
+        assert result.notices_created == 2
+        assert result.events_dispatched == 2
+        assert result.processing_time_seconds > 0
+        assert len(result.errors) == 0
+
+    @pytest.mark.parametrize(
+        "healthy, calls",
+        [(True, 1), (False, 1), (True, 5)],
+        ids=["healthy", "connection_failure", "connection_pooling"],
     )
+    def test_database_health_check(self, context, healthy, calls):
+        """Test database health check, failure and repeated (pooled) checks."""
+        with patch.object(context.read_client, "health_check", return_value=healthy):
+            for _i in range(calls):
+                assert context.read_client.health_check() is healthy
+
     def test_database_timeout_handling(self, context, sample_invoices):
         """Test database timeout handling."""
         # Mock timeout
@@ -133,49 +130,32 @@ class TestFlowSmokeLocalDB:
             with pytest.raises(Exception, match="Timeout"):
                 context.read_client.get_overdue_invoices()
 
-    @pytest.mark.skipif(
-        os.getenv("RUN_DB_TESTS") != "1",
-        reason="Database tests disabled (set RUN_DB_TESTS=1 to enable)",
-    )
-    def test_database_rls_enforcement(self, context):
-        """Test database RLS enforcement."""
-        # Mock RLS enforcement
-        with patch.object(context.read_client, "get_overdue_invoices") as mock_get:
-            # Simulate RLS filtering
-            mock_get.return_value = Mock(
-                invoices=[],  # No invoices due to RLS
-                next_cursor=None,
-                total_count=0,
-                has_more=False,
-            )
-
-            response = context.read_client.get_overdue_invoices()
-            assert len(response.invoices) == 0
-
-    @pytest.mark.skipif(
-        os.getenv("RUN_DB_TESTS") != "1",
-        reason="Database tests disabled (set RUN_DB_TESTS=1 to enable)",
+    @pytest.mark.parametrize(
+        "count, next_cursor, has_more, total_count",
+        [
+            (0, None, False, 0),  # RLS filters out every row / empty result schema
+            (1, "cursor-123", True, 2),  # first page of two
+        ],
+        ids=["rls_empty", "pagination"],
     )
-    def test_database_pagination(self, context, sample_invoices):
-        """Test database pagination."""
-        # Mock paginated response
+    def test_database_page_shape(
+        self, context, sample_invoices, count, next_cursor, has_more, total_count
+    ):
+        """Test RLS filtering, pagination and response schema of overdue pages."""
         with patch.object(context.read_client, "get_overdue_invoices") as mock_get:
-            mock_get.return_value = Mock(
-                invoices=sample_invoices[:1],  # First page
-                next_cursor="cursor-123",
-                total_count=len(sample_invoices),
-                has_more=True,
+            mock_get.return_value = OverdueInvoicesResponse(
+                invoices=sample_invoices[:count],
+                next_cursor=next_cursor,
+                total_count=total_count,
+                has_more=has_more,
             )
 
             response = context.read_client.get_overdue_invoices()
-            assert len(response.invoices) == 1
-            assert response.next_cursor == "cursor-123"
-            assert response.has_more is True
+            assert len(response.invoices) == count
+            assert response.next_cursor == next_cursor
+            assert response.has_more is has_more
+            assert response.total_count == total_count
 
-    @pytest.mark.skipif(
-        os.getenv("RUN_DB_TESTS") != "1",
-        reason="Database tests disabled (set RUN_DB_TESTS=1 to enable)",
-    )
     def test_database_transaction_rollback(self, context):
         """Test database transaction rollback."""
         # Mock transaction failure
@@ -190,15 +170,11 @@ class TestFlowSmokeLocalDB:
             )
             assert result is False
 
-    @pytest.mark.skipif(
-        os.getenv("RUN_DB_TESTS") != "1",
-        reason="Database tests disabled (set RUN_DB_TESTS=1 to enable)",
-    )
     def test_database_concurrent_access(self, context, sample_invoices):
         """Test database concurrent access."""
         # Mock concurrent access
         with patch.object(context.read_client, "get_overdue_invoices") as mock_get:
-            mock_get.return_value = Mock(
+            mock_get.return_value = OverdueInvoicesResponse(
                 invoices=sample_invoices,
                 next_cursor=None,
                 total_count=len(sample_invoices),
@@ -211,23 +187,6 @@ class TestFlowSmokeLocalDB:
 
             assert len(response1.invoices) == len(response2.invoices)
 
-    @pytest.mark.skipif(
-        os.getenv("RUN_DB_TESTS") != "1",
-        reason="Database tests disabled (set RUN_DB_TESTS=1 to enable)",
-    )
-    def test_database_connection_pooling(self, context):
-        """Test database connection pooling."""
-        # Mock connection pool
-        with patch.object(context.read_client, "health_check", return_value=True):
-            # Simulate multiple connections
-            for _i in range(5):
-                is_healthy = context.read_client.health_check()
-                assert is_healthy is True
-
-    @pytest.mark.skipif(
-        os.getenv("RUN_DB_TESTS") != "1",
-        reason="Database tests disabled (set RUN_DB_TESTS=1 to enable)",
-    )
     def test_database_metrics_collection(self, context):
         """Test database metrics collection."""
         # Mock metrics collection
@@ -240,10 +199,6 @@ class TestFlowSmokeLocalDB:
             assert "queries" in metrics
             assert "avg_response_time" in metrics
 
-    @pytest.mark.skipif(
-        os.getenv("RUN_DB_TESTS") != "1",
-        reason="Database tests disabled (set RUN_DB_TESTS=1 to enable)",
-    )
     def test_database_error_recovery(self, context, sample_invoices):
         """Test database error recovery."""
         # Mock error recovery
@@ -251,7 +206,7 @@ class TestFlowSmokeLocalDB:
             # First call fails, second succeeds
             mock_get.side_effect = [
                 Exception("Temporary error"),
-                Mock(
+                OverdueInvoicesResponse(
                     invoices=sample_invoices,
                     next_cursor=None,
                     total_count=len(sample_invoices),
@@ -266,61 +221,3 @@ class TestFlowSmokeLocalDB:
             # Second call should succeed
             response = context.read_client.get_overdue_invoices()
             assert len(response.invoices) == len(sample_invoices)
-
-    @pytest.mark.skipif(
-        os.getenv("RUN_DB_TESTS") != "1",
-        reason="Database tests disabled (set RUN_DB_TESTS=1 to enable)",
-    )
-    def test_database_schema_validation(self, context):
-        """Test database schema validation."""
-        # Mock schema validation
-        with patch.object(context.read_client, "get_overdue_invoices") as mock_get:
-            mock_get.return_value = Mock(
-                invoices=[], next_cursor=None, total_count=0, has_more=False  # Empty result
-            )
-
-            response = context.read_client.get_overdue_invoices()
-            assert response.total_count == 0
-            assert response.has_more is False
-
-    @pytest.mark.skipif(
-        os.getenv("RUN_DB_TESTS") != "1",
-        reason="Database tests disabled (set RUN_DB_TESTS=1 to enable)",
-    )
-    def test_database_performance_benchmark(self, context, sample_invoices):
-        """Test database performance benchmark."""
-        import time
-
-        # Mock performance test
-        with patch.object(context.read_client, "get_overdue_invoices") as mock_get:
-            mock_get.return_value = Mock(
-                invoices=sample_invoices,
-                next_cursor=None,
-                total_count=len(sample_invoices),
-                has_more=False,
-            )
-
-            start_time = time.time()
-            response = context.read_client.get_overdue_invoices()
-            end_time = time.time()
-
-            # Check performance (should be fast in mock)
-            assert end_time - start_time < 1.0  # Less than 1 second
-            assert len(response.invoices) == len(sample_invoices)
-
-    def test_skip_when_db_tests_disabled(self):
-        """Test that database tests are skipped when disabled."""
-        # This test should always pass
-        assert os.getenv("RUN_DB_TESTS") != "1" or True
-
-    def test_database_test_environment_check(self):
-        """Test database test environment check."""
-        # Check environment variables
-        db_tests_enabled = os.getenv("RUN_DB_TESTS") == "1"
-
-        if db_tests_enabled:
-            # Database tests are enabled
-            assert True
-        else:
-            # Database tests are disabled
-            assert True
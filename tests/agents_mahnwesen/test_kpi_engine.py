@@ -2,12 +2,12 @@
 
 from __future__ import annotations
 
-import json
 from datetime import UTC, date, datetime, timedelta
 from pathlib import Path
 
 import pytest
 
+from tests.agents_mahnwesen._fixtures import dump_json_bytes, ensure_tree
 from tools.operate.kpi_engine import KpiAggregator, LocalArtifactDataSource
 
 
@@ -16,14 +16,37 @@ def tenant_setup(tmp_path: Path) -> tuple[str, Path, Path]:
     tenant_id = "tenant-test"
     base = tmp_path / "artifacts" / "reports" / "mahnwesen"
     tenant_dir = base / tenant_id
-    (tenant_dir / "audit").mkdir(parents=True)
-    (tenant_dir / "outbox").mkdir()
-    (tenant_dir / "ops").mkdir()
+    ensure_tree(tenant_dir, ("audit", "outbox", "ops"))
     return tenant_id, base, tenant_dir
 
 
-def test_cycle_time_median_hours(tenant_setup: tuple[str, Path, Path]) -> None:
-    tenant_id, base, tenant_dir = tenant_setup
+_MEMORY_BASE = Path("artifacts") / "reports" / "mahnwesen"
+
+
+@pytest.fixture(scope="module")
+def memory_files() -> dict[Path, object]:
+    """Dict-backed artefact store read by ``memory_aggregator``."""
+    return {}
+
+
+@pytest.fixture(scope="module")
+def memory_aggregator(memory_files: dict[Path, object]) -> KpiAggregator:
+    """One aggregator for the module; tests swap artefacts via ``memory_artifacts``."""
+    return KpiAggregator(LocalArtifactDataSource(_MEMORY_BASE, reader=memory_files.get))
+
+
+@pytest.fixture
+def memory_artifacts(memory_files: dict[Path, object]) -> tuple[str, Path, dict[Path, object]]:
+    """Empty the shared in-memory artefacts for this test; no disk I/O."""
+    memory_files.clear()
+    return "tenant-test", _MEMORY_BASE, memory_files
+
+
+def test_cycle_time_median_hours(
+    memory_artifacts: tuple[str, Path, dict[Path, object]], memory_aggregator: KpiAggregator
+) -> None:
+    tenant_id, base, files = memory_artifacts
+    tenant_dir = base / tenant_id
 
     created_at = datetime(2025, 10, 28, 7, tzinfo=UTC)
     second_created = created_at + timedelta(hours=1)
@@ -53,13 +76,8 @@ def test_cycle_time_median_hours(tenant_setup: tuple[str, Path, Path]) -> None:
             },
         ]
     }
-    (tenant_dir / "audit" / "approvals.json").write_text(
-        json.dumps(approvals, indent=2), encoding="utf-8"
-    )
-
-    (tenant_dir / "outbox" / "sent.json").write_text(
-        json.dumps({"keys": ["abc", "def"]}), encoding="utf-8"
-    )
+    files[tenant_dir / "audit" / "approvals.json"] = approvals
+    files[tenant_dir / "outbox" / "sent.json"] = {"keys": ["abc", "def"]}
 
     blocklist = {
         "entries": {
@@ -67,17 +85,13 @@ def test_cycle_time_median_hours(tenant_setup: tuple[str, Path, Path]) -> None:
             "hash-soft": {"status": "soft", "attempt_timestamps": []},
         }
     }
-    (tenant_dir / "ops" / "blocklist.json").write_text(json.dumps(blocklist), encoding="utf-8")
+    files[tenant_dir / "ops" / "blocklist.json"] = blocklist
+    files[tenant_dir / "ops" / "queue_metrics.json"] = {"retry_depth": 5, "dlq_depth": 0}
 
-    queue_metrics = {"retry_depth": 5, "dlq_depth": 0}
-    (tenant_dir / "ops" / "queue_metrics.json").write_text(
-        json.dumps(queue_metrics), encoding="utf-8"
+    report = memory_aggregator.build_report(
+        tenant_id, report_date=date(2025, 10, 29), now=datetime(2025, 10, 29, 7, tzinfo=UTC)
     )
 
-    data_source = LocalArtifactDataSource(base)
-    aggregator = KpiAggregator(data_source)
-    report = aggregator.build_report(tenant_id, report_date=date(2025, 10, 29), now=datetime(2025, 10, 29, 7, tzinfo=UTC))
-
     assert report.metrics.cycle_time_median_hours == 3.0
     assert report.metrics.hard_bounces == 1
     assert report.metrics.soft_bounces == 1
@@ -85,18 +99,29 @@ def test_cycle_time_median_hours(tenant_setup: tuple[str, Path, Path]) -> None:
     assert report.timezone == "Europe/Berlin"
 
 
-def test_cycle_time_note_when_missing(tenant_setup: tuple[str, Path, Path]) -> None:
-    tenant_id, base, tenant_dir = tenant_setup
-
-    (tenant_dir / "outbox" / "sent.json").write_text(
-        json.dumps({"keys": ["only-key"]}), encoding="utf-8"
-    )
+def test_cycle_time_note_when_missing(
+    memory_artifacts: tuple[str, Path, dict[Path, object]], memory_aggregator: KpiAggregator
+) -> None:
+    tenant_id, base, files = memory_artifacts
+    files[base / tenant_id / "outbox" / "sent.json"] = {"keys": ["only-key"]}
 
-    data_source = LocalArtifactDataSource(base)
-    aggregator = KpiAggregator(data_source)
-    report = aggregator.build_report(tenant_id, report_date=date(2025, 10, 29))
+    report = memory_aggregator.build_report(tenant_id, report_date=date(2025, 10, 29))
 
     assert report.metrics.cycle_time_median_hours is None
     assert report.metrics.cycle_time_note is not None
     assert report.metrics.notices_sent == 1
 
+
+
+def test_artifact_reads_follow_rewrites(tenant_setup: tuple[str, Path, Path]) -> None:
+    tenant_id, base, tenant_dir = tenant_setup
+    sent_path = tenant_dir / "outbox" / "sent.json"
+    aggregator = KpiAggregator(LocalArtifactDataSource(base))
+
+    sent_path.write_bytes(dump_json_bytes({"keys": ["k1"]}))
+    first = aggregator.build_report(tenant_id, report_date=date(2025, 10, 29))
+    sent_path.write_bytes(dump_json_bytes({"keys": ["k1", "k2"]}))
+    second = aggregator.build_report(tenant_id, report_date=date(2025, 10, 29))
+
+    assert first.metrics.notices_sent == 1
+    assert second.metrics.notices_sent == 2
@@ -2,6 +2,7 @@
 
 from datetime import UTC, datetime
 from pathlib import Path
+from typing import Iterator
 
 import pytest
 
@@ -11,17 +12,14 @@ from agents.mahnwesen.providers import LocalOverdueProvider
 TENANT_ID = "00000000-0000-0000-0000-000000000001"
 
 
-@pytest.fixture
-def provider() -> LocalOverdueProvider:
-    sent_path = (
-        Path("artifacts/reports/mahnwesen")
-        / TENANT_ID
-        / "outbox"
-        / "sent.json"
-    )
-    if sent_path.exists():
-        sent_path.unlink()
-    return LocalOverdueProvider()
+@pytest.fixture(scope="module")
+def provider(tmp_path_factory: pytest.TempPathFactory) -> Iterator[LocalOverdueProvider]:
+    # The provider reads sent.json relative to cwd; an empty cwd means no invoice
+    # is filtered as sent and xdist workers never share the file. Loading is
+    # read-only, so one instance serves the whole module.
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(tmp_path_factory.mktemp("provider"))
+        yield LocalOverdueProvider()
 
 
 def test_provider_returns_expected_distribution(provider: LocalOverdueProvider) -> None:
@@ -9,53 +9,62 @@ from pathlib import Path
 
 import pytest
 
+from tests.agents_mahnwesen._fixtures import dump_json_bytes, ensure_tree
 from tools.operate.canary_rollout import apply_rollout
 from tools.operate.morning_operate import run_morning_for_tenant
 
 
-@pytest.fixture
-def fixture_paths(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> tuple[str, Path]:
-    tenant = "00000000-0000-0000-0000-000000000001"
-    base = tmp_path
-    (base / tenant / "operate").mkdir(parents=True, exist_ok=True)
-    (base / tenant / "ops").mkdir(exist_ok=True)
-    # Baseline operate state
-    (base / tenant / "operate" / "operate_state.json").write_text(
-        json.dumps({"kill_switch": False, "rollout_percentage": 10}),
-        encoding="utf-8",
-    )
-    # Ensure LocalArtifactDataSource can resolve samples (uses repo files)
-    monkeypatch.chdir(Path.cwd())
-    return tenant, base
-
+TENANT_ID = "00000000-0000-0000-0000-000000000001"
 
-def _seed_positive_kpi(base: Path, tenant: str) -> None:
-    tenant_dir = base / tenant
-    approvals = {
+# Positive KPI artefacts for TENANT_ID, serialized once for every seeding call
+_APPROVAL_TEMPLATE = {
+    "tenant_id": TENANT_ID,
+    "stage": 1,
+    "status": "sent",
+    "requester": "operate-cli",
+    "created_at": "2025-10-29T07:00:00+00:00",
+    "updated_at": "2025-10-29T07:05:00+00:00",
+}
+_APPROVALS_BYTES = dump_json_bytes(
+    {
         "records": [
             {
-                "tenant_id": tenant,
+                **_APPROVAL_TEMPLATE,
                 "notice_id": f"NOTICE-{idx}",
                 "invoice_id": f"INV-{idx}",
-                "stage": 1,
                 "idempotency_key": f"key-{idx}",
-                "status": "sent",
-                "requester": "operate-cli",
-                "created_at": "2025-10-29T07:00:00+00:00",
-                "updated_at": "2025-10-29T07:05:00+00:00",
             }
             for idx in range(3)
         ]
     }
-    (tenant_dir / "audit").mkdir(exist_ok=True)
-    (tenant_dir / "audit" / "approvals.json").write_text(json.dumps(approvals), encoding="utf-8")
+)
+_OUTBOX_BYTES = dump_json_bytes({"keys": [f"key-{idx}" for idx in range(3)]})
+_BLOCKLIST_BYTES = dump_json_bytes({"entries": {}})
+_BASELINE_STATE_BYTES = dump_json_bytes({"kill_switch": False, "rollout_percentage": 10})
+
+
+@pytest.fixture
+def fixture_paths(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> tuple[str, Path]:
+    tenant = TENANT_ID
+    base = tmp_path
+    ensure_tree(base / tenant, ("operate", "ops", "audit", "outbox"))
+    # Baseline operate state
+    (base / tenant / "operate" / "operate_state.json").write_bytes(_BASELINE_STATE_BYTES)
+    # Everything is resolved via base_path; a per-test cwd keeps stray relative
+    # writes off the shared repo tree when running under xdist
+    monkeypatch.chdir(base)
+    return tenant, base
+
+
+def _seed_positive_kpi(base: Path) -> None:
+    tenant_dir = base / TENANT_ID
+    (tenant_dir / "audit" / "approvals.json").write_bytes(_APPROVALS_BYTES)
+    (tenant_dir / "outbox" / "sent.json").write_bytes(_OUTBOX_BYTES)
+    (tenant_dir / "ops" / "blocklist.json").write_bytes(_BLOCKLIST_BYTES)
 
-    outbox = {"keys": [f"key-{idx}" for idx in range(3)]}
-    (tenant_dir / "outbox").mkdir(exist_ok=True)
-    (tenant_dir / "outbox" / "sent.json").write_text(json.dumps(outbox), encoding="utf-8")
 
-    blocklist = {"entries": {}}
-    (tenant_dir / "ops" / "blocklist.json").write_text(json.dumps(blocklist), encoding="utf-8")
+def _read_operate_state(base: Path) -> dict:
+    return json.loads((base / TENANT_ID / "operate" / "operate_state.json").read_bytes())
 
 
 def test_morning_operate_dry_run_idempotent(fixture_paths: tuple[str, Path]) -> None:
@@ -69,20 +78,16 @@ def test_morning_operate_dry_run_idempotent(fixture_paths: tuple[str, Path]) ->
     assert result["rollout_changed"] is False
 
     # Operate state unchanged
-    state_path = base / tenant / "operate" / "operate_state.json"
-    state = json.loads(state_path.read_text(encoding="utf-8"))
+    state = _read_operate_state(base)
     assert state["rollout_percentage"] == 10
 
 
 def test_morning_operate_live_rollout_progression(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
-    tenant = "00000000-0000-0000-0000-000000000001"
+    tenant = TENANT_ID
     base = tmp_path
-    (base / tenant / "operate").mkdir(parents=True, exist_ok=True)
-    (base / tenant / "ops").mkdir(exist_ok=True)
-    (base / tenant / "operate" / "operate_state.json").write_text(
-        json.dumps({"kill_switch": False, "rollout_percentage": 10}), encoding="utf-8"
-    )
-    _seed_positive_kpi(base, tenant)
+    ensure_tree(base / tenant, ("operate", "ops", "audit", "outbox"))
+    (base / tenant / "operate" / "operate_state.json").write_bytes(_BASELINE_STATE_BYTES)
+    _seed_positive_kpi(base)
 
     # Override thresholds to permissive values
     monkeypatch.setenv("CANARY_THRESHOLD_ERROR_RATE", "0.5")
@@ -92,12 +97,14 @@ def test_morning_operate_live_rollout_progression(tmp_path: Path, monkeypatch: p
     assert result["decision"] in {"GO_25", "GO_50", "GO_100"}
     assert result["rollout_changed"] is True
 
-    state_path = base / tenant / "operate" / "operate_state.json"
-    state = json.loads(state_path.read_text(encoding="utf-8"))
+    state = result["rollout_state"]
     assert state["rollout_percentage"] >= 25
 
     # Second run without new KPI should not regress
     second = run_morning_for_tenant(tenant, date(2025, 10, 29), dry_run=False, base_path=base)
     assert Path(second["summary_md"]).exists()
-    assert json.loads(state_path.read_text(encoding="utf-8"))["rollout_percentage"] >= state["rollout_percentage"]
+    final_state = _read_operate_state(base)
+    assert final_state["rollout_percentage"] >= state["rollout_percentage"]
+    # The in-process state must match what was persisted for the next run
+    assert final_state["rollout_percentage"] == second["rollout_state"]["rollout_percentage"]
 
@@ -6,6 +6,12 @@ from agents.mahnwesen.dto import DunningStage
 from agents.mahnwesen.mvr_approval import ApprovalStatus, MVRApprovalEngine
 
 
+@pytest.fixture
+def approval_engine():
+    """Approval engine with default settings."""
+    return MVRApprovalEngine()
+
+
 class TestMVRApprovalEngine:
     """Test MVR approval engine for 4-Augen-Prinzip."""
 
@@ -25,11 +31,9 @@ class TestMVRApprovalEngine:
         assert engine.requires_approval(DunningStage.STAGE_2)
         assert engine.requires_approval(DunningStage.STAGE_3)
 
-    def test_create_approval_request(self):
+    def test_create_approval_request(self, approval_engine):
         """Test creating an approval request."""
-        engine = MVRApprovalEngine()
-
-        request = engine.create_approval_request(
+        request = approval_engine.create_approval_request(
             tenant_id="tenant-1",
             notice_id="NOTICE-001",
             invoice_id="INV-001",
@@ -46,12 +50,10 @@ class TestMVRApprovalEngine:
         assert request.approver is None
         assert request.created_at is not None
 
-    def test_approve_success(self):
+    def test_approve_success(self, approval_engine):
         """Test successful approval with 4-Augen-Prinzip."""
-        engine = MVRApprovalEngine()
-
         # Create request
-        _request = engine.create_approval_request(
+        _request = approval_engine.create_approval_request(
             tenant_id="tenant-1",
             notice_id="NOTICE-001",
             invoice_id="INV-001",
@@ -60,7 +62,7 @@ class TestMVRApprovalEngine:
         )
 
         # Approve with different user
-        approved = engine.approve(
+        approved = approval_engine.approve(
             tenant_id="tenant-1",
             notice_id="NOTICE-001",
             stage=DunningStage.STAGE_2,
@@ -72,14 +74,12 @@ class TestMVRApprovalEngine:
         assert approved.approver == "user2"
         assert approved.comment == "Approved for sending"
         assert approved.approved_at is not None
-        assert engine.is_approved("tenant-1", "NOTICE-001", DunningStage.STAGE_2)
+        assert approval_engine.is_approved("tenant-1", "NOTICE-001", DunningStage.STAGE_2)
 
-    def test_approve_same_user_fails(self):
+    def test_approve_same_user_fails(self, approval_engine):
         """Test that approval fails when approver = requester (4-Augen violation)."""
-        engine = MVRApprovalEngine()
-
         # Create request
-        engine.create_approval_request(
+        approval_engine.create_approval_request(
             tenant_id="tenant-1",
             notice_id="NOTICE-001",
             invoice_id="INV-001",
@@ -89,7 +89,7 @@ class TestMVRApprovalEngine:
 
         # Try to approve with same user
         with pytest.raises(ValueError) as exc_info:
-            engine.approve(
+            approval_engine.approve(
                 tenant_id="tenant-1",
                 notice_id="NOTICE-001",
                 stage=DunningStage.STAGE_2,
@@ -98,14 +98,12 @@ class TestMVRApprovalEngine:
             )
 
         assert "4-Augen-Prinzip verletzt" in str(exc_info.value)
-        assert not engine.is_approved("tenant-1", "NOTICE-001", DunningStage.STAGE_2)
+        assert not approval_engine.is_approved("tenant-1", "NOTICE-001", DunningStage.STAGE_2)
 
-    def test_reject(self):
+    def test_reject(self, approval_engine):
         """Test rejection of approval request."""
-        engine = MVRApprovalEngine()
-
         # Create request
-        engine.create_approval_request(
+        approval_engine.create_approval_request(
             tenant_id="tenant-1",
             notice_id="NOTICE-001",
             invoice_id="INV-001",
@@ -114,7 +112,7 @@ class TestMVRApprovalEngine:
         )
 
         # Reject
-        rejected = engine.reject(
+        rejected = approval_engine.reject(
             tenant_id="tenant-1",
             notice_id="NOTICE-001",
             stage=DunningStage.STAGE_2,
@@ -125,7 +123,7 @@ class TestMVRApprovalEngine:
         assert rejected.status == ApprovalStatus.REJECTED
         assert rejected.approver == "user2"
         assert rejected.comment == "Customer already paid"
-        assert not engine.is_approved("tenant-1", "NOTICE-001", DunningStage.STAGE_2)
+        assert not approval_engine.is_approved("tenant-1", "NOTICE-001", DunningStage.STAGE_2)
 
     def test_can_send_stage_1_no_approval_required(self):
         """Test that Stage 1 can send without approval by default."""
@@ -136,29 +134,25 @@ class TestMVRApprovalEngine:
         assert can_send
         assert reason is None
 
-    def test_can_send_stage_2_without_approval_blocked(self):
+    def test_can_send_stage_2_without_approval_blocked(self, approval_engine):
         """Test that Stage 2 is blocked without approval."""
-        engine = MVRApprovalEngine()
-
-        can_send, reason = engine.can_send("tenant-1", "NOTICE-001", DunningStage.STAGE_2)
+        can_send, reason = approval_engine.can_send("tenant-1", "NOTICE-001", DunningStage.STAGE_2)
 
         assert not can_send
         assert "requires approval" in reason
         assert "4-Augen-Prinzip" in reason
 
-    def test_can_send_stage_2_with_approval_allowed(self):
+    def test_can_send_stage_2_with_approval_allowed(self, approval_engine):
         """Test that Stage 2 can send after approval."""
-        engine = MVRApprovalEngine()
-
         # Create and approve
-        engine.create_approval_request(
+        approval_engine.create_approval_request(
             tenant_id="tenant-1",
             notice_id="NOTICE-001",
             invoice_id="INV-001",
             stage=DunningStage.STAGE_2,
             requester="user1",
         )
-        engine.approve(
+        approval_engine.approve(
             tenant_id="tenant-1",
             notice_id="NOTICE-001",
             stage=DunningStage.STAGE_2,
@@ -166,40 +160,29 @@ class TestMVRApprovalEngine:
             comment="OK",
         )
 
-        can_send, reason = engine.can_send("tenant-1", "NOTICE-001", DunningStage.STAGE_2)
+        can_send, reason = approval_engine.can_send("tenant-1", "NOTICE-001", DunningStage.STAGE_2)
 
         assert can_send
         assert reason is None
 
-    def test_get_pending_approvals(self):
+    def test_get_pending_approvals(self, approval_engine):
         """Test retrieving pending approvals for a tenant."""
-        engine = MVRApprovalEngine()
-
         # Create multiple requests
-        engine.create_approval_request(
-            tenant_id="tenant-1",
-            notice_id="NOTICE-001",
-            invoice_id="INV-001",
-            stage=DunningStage.STAGE_2,
-            requester="user1",
-        )
-        engine.create_approval_request(
-            tenant_id="tenant-1",
-            notice_id="NOTICE-002",
-            invoice_id="INV-002",
-            stage=DunningStage.STAGE_3,
-            requester="user1",
-        )
-        engine.create_approval_request(
-            tenant_id="tenant-2",
-            notice_id="NOTICE-003",
-            invoice_id="INV-003",
-            stage=DunningStage.STAGE_2,
-            requester="user1",
-        )
+        for tenant_id, notice_id, invoice_id, stage in (
+            ("tenant-1", "NOTICE-001", "INV-001", DunningStage.STAGE_2),
+            ("tenant-1", "NOTICE-002", "INV-002", DunningStage.STAGE_3),
+            ("tenant-2", "NOTICE-003", "INV-003", DunningStage.STAGE_2),
+        ):
+            approval_engine.create_approval_request(
+                tenant_id=tenant_id,
+                notice_id=notice_id,
+                invoice_id=invoice_id,
+                stage=stage,
+                requester="user1",
+            )
 
         # Approve one
-        engine.approve(
+        approval_engine.approve(
             tenant_id="tenant-1",
             notice_id="NOTICE-001",
             stage=DunningStage.STAGE_2,
@@ -208,7 +191,7 @@ class TestMVRApprovalEngine:
         )
 
         # Get pending for tenant-1
-        pending = engine.get_pending_approvals("tenant-1")
+        pending = approval_engine.get_pending_approvals("tenant-1")
 
         assert len(pending) == 1
         assert pending[0].notice_id == "NOTICE-002"
@@ -1,13 +1,25 @@
 """Tests for MVR dispatch in dry-run mode."""
 
+from collections import namedtuple
 from datetime import UTC, datetime, timedelta
-from unittest.mock import Mock, patch
+from types import SimpleNamespace
+from unittest.mock import DEFAULT, patch
 
 import pytest
 
+from agents.mahnwesen.approval_store import ApprovalStore
 from agents.mahnwesen.config import DunningConfig
 from agents.mahnwesen.mvr import OverdueInvoice
 from agents.mahnwesen.playbooks import DunningContext, DunningPlaybook
+from tests.agents_mahnwesen._fixtures import seed_rate_limit
+
+# Plain stand-ins for client responses; the playbook only reads these attributes.
+_EMPTY_PAGE = SimpleNamespace(invoices=[])
+_BrevoResult = namedtuple("_BrevoResult", "success dry_run message_id error")
+_BREVO_DRY_RUN_OK = _BrevoResult(success=True, dry_run=True, message_id=None, error=None)
+
+# Skip rendering and sending for tests that only count notices and events.
+_PASSTHROUGH_TEMPLATES = SimpleNamespace(render_notice=lambda notice, stage: notice)
 
 
 @pytest.fixture
@@ -24,9 +36,14 @@ def test_config():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_invoices():
-    """Sample overdue invoices."""
+    """Sample overdue invoices, shared by the module.
+
+    Tests must not mutate the list or its invoices; use ``list(...)`` or
+    ``dataclasses.replace`` to derive variants.
+    """
+    now = datetime.now(UTC)
     return [
         OverdueInvoice(
             invoice_id="INV-001",
@@ -35,9 +52,9 @@ def sample_invoices():
             customer_name="Test Customer 1",
             customer_email="test1@example.com",
             amount_cents=5000,
-            due_date=datetime.now(UTC) - timedelta(days=10),
+            due_date=now - timedelta(days=10),
             invoice_number="INV-001",
-            created_at=datetime.now(UTC) - timedelta(days=15),
+            created_at=now - timedelta(days=15),
         ),
         OverdueInvoice(
             invoice_id="INV-002",
@@ -46,42 +63,73 @@ def sample_invoices():
             customer_name="Test Customer 2",
             customer_email="test2@example.com",
             amount_cents=3000,
-            due_date=datetime.now(UTC) - timedelta(days=20),
+            due_date=now - timedelta(days=20),
             invoice_number="INV-002",
-            created_at=datetime.now(UTC) - timedelta(days=25),
+            created_at=now - timedelta(days=25),
         ),
     ]
 
 
-class TestMVREispatchDryRun:
-    """Test MVR dispatch in dry-run mode."""
+@pytest.fixture(scope="module")
+def overdue_page(sample_invoices):
+    """Read API response carrying the sample invoices."""
+    return SimpleNamespace(invoices=sample_invoices)
 
-    @patch("agents.mahnwesen.playbooks.ReadApiClient")
-    @patch("agents.mahnwesen.playbooks.OutboxClient")
-    def test_dry_run_no_side_effects(
-        self, mock_outbox, mock_read_api, test_config, sample_invoices
-    ):
-        """Test that dry-run mode produces no side effects."""
-        # Setup mocks
-        mock_read_api.return_value.get_overdue_invoices.return_value = Mock(
-            invoices=sample_invoices
-        )
-        mock_outbox.return_value.check_duplicate_event.return_value = False
-        mock_outbox.return_value.publish_dunning_issued.return_value = True
 
-        # Create context
-        context = DunningContext(
-            tenant_id="test-tenant",
-            correlation_id="test-correlation",
-            dry_run=True,
-            config=test_config,
-        )
+@pytest.fixture
+def approval_store(tmp_path):
+    """Approval store kept out of the shared artifacts tree."""
+    return ApprovalStore(base_path=tmp_path)
+
+
+@pytest.fixture
+def light_playbook(test_config):
+    """Playbook whose sender always reports a dry-run success."""
+    return DunningPlaybook(test_config, sender=lambda **_: _BREVO_DRY_RUN_OK)
 
-        # Create playbook
-        playbook = DunningPlaybook(test_config)
 
+@pytest.fixture
+def light_context(test_config, approval_store):
+    """Dry-run context that leaves notices unrendered."""
+    return DunningContext(
+        tenant_id="test-tenant",
+        correlation_id="test-correlation",
+        dry_run=True,
+        config=test_config,
+        template_engine=_PASSTHROUGH_TEMPLATES,
+        approval_store=approval_store,
+    )
+
+
+@pytest.fixture(autouse=True)
+def clients(overdue_page):
+    """Patch the playbook's API clients and Brevo sender for every test.
+
+    Yields the mocks keyed by patched name; tests adjust return values or
+    side effects on them before running the playbook.
+    """
+    with patch.multiple(
+        "agents.mahnwesen.playbooks",
+        ReadApiClient=DEFAULT,
+        OutboxClient=DEFAULT,
+        send_transactional=DEFAULT,
+    ) as mocks:
+        mocks["ReadApiClient"].return_value.get_overdue_invoices.return_value = overdue_page
+        mocks["send_transactional"].return_value = _BREVO_DRY_RUN_OK
+        outbox = mocks["OutboxClient"].return_value
+        outbox.check_duplicate_event.return_value = False
+        outbox.publish_dunning_issued.return_value = True
+        yield mocks
+
+
+@pytest.mark.slow
+class TestMVREispatchDryRun:
+    """Test MVR dispatch in dry-run mode."""
+
+    def test_dry_run_no_side_effects(self, clients, light_playbook, light_context):
+        """Test that dry-run mode produces no side effects."""
         # Run dry-run
-        _result = playbook.run_once(context)
+        _result = light_playbook.run_once(light_context)
 
         # Verify results
         assert _result.success
@@ -93,21 +141,11 @@ class TestMVREispatchDryRun:
         assert _result.processing_time_seconds > 0
 
         # Verify no actual API calls were made
-        mock_outbox.return_value.publish_dunning_issued.assert_not_called()
-
-    @patch("agents.mahnwesen.playbooks.ReadApiClient")
-    @patch("agents.mahnwesen.playbooks.OutboxClient")
-    @patch("agents.mahnwesen.playbooks.send_transactional")
-    def test_dry_run_brevo_simulation(
-        self, mock_brevo, mock_outbox, mock_read_api, test_config, sample_invoices
-    ):
+        clients["OutboxClient"].return_value.publish_dunning_issued.assert_not_called()
+
+    def test_dry_run_brevo_simulation(self, clients, test_config, approval_store):
         """Test that dry-run mode simulates Brevo sending."""
-        # Setup mocks
-        mock_read_api.return_value.get_overdue_invoices.return_value = Mock(
-            invoices=sample_invoices
-        )
-        mock_outbox.return_value.check_duplicate_event.return_value = False
-        mock_brevo.return_value = Mock(success=True, dry_run=True)
+        mock_brevo = clients["send_transactional"]
 
         # Create context
         context = DunningContext(
@@ -115,6 +153,7 @@ class TestMVREispatchDryRun:
             correlation_id="test-correlation",
             dry_run=True,
             config=test_config,
+            approval_store=approval_store,
         )
 
         # Create playbook
@@ -132,32 +171,22 @@ class TestMVREispatchDryRun:
             assert kwargs["dry_run"] is True
             assert kwargs["tenant_id"] == "test-tenant"
 
-    @patch("agents.mahnwesen.playbooks.ReadApiClient")
-    @patch("agents.mahnwesen.playbooks.OutboxClient")
-    def test_rate_limiting_bypass_in_dry_run(
-        self, mock_outbox, mock_read_api, test_config, sample_invoices
-    ):
+    def test_rate_limiting_bypass_in_dry_run(self, test_config, approval_store):
         """Test that rate limiting is bypassed in dry-run mode."""
-        # Setup mocks
-        mock_read_api.return_value.get_overdue_invoices.return_value = Mock(
-            invoices=sample_invoices
-        )
-        mock_outbox.return_value.check_duplicate_event.return_value = False
-
         # Create context
         context = DunningContext(
             tenant_id="test-tenant",
             correlation_id="test-correlation",
             dry_run=True,
             config=test_config,
+            approval_store=approval_store,
         )
 
         # Create playbook
         playbook = DunningPlaybook(test_config)
 
-        # Exhaust rate limit first
-        for _i in range(15):  # More than max_notices_per_hour
-            context.mvr_engine._check_rate_limit("test-tenant")
+        # Exhaust rate limit first (more than max_notices_per_hour)
+        seed_rate_limit(context.mvr_engine, "test-tenant", 15)
 
         # Run dry-run (should still work despite rate limit)
         result = playbook.run_once(context)
@@ -166,58 +195,23 @@ class TestMVREispatchDryRun:
         assert result.success
         assert result.notices_created == 2
 
-    @patch("agents.mahnwesen.playbooks.ReadApiClient")
-    @patch("agents.mahnwesen.playbooks.OutboxClient")
-    def test_deterministic_processing(
-        self, mock_outbox, mock_read_api, test_config, sample_invoices
-    ):
+    def test_deterministic_processing(self, light_playbook, light_context):
         """Test that processing is deterministic."""
-        # Setup mocks
-        mock_read_api.return_value.get_overdue_invoices.return_value = Mock(
-            invoices=sample_invoices
-        )
-        mock_outbox.return_value.check_duplicate_event.return_value = False
-
-        # Create context
-        context = DunningContext(
-            tenant_id="test-tenant",
-            correlation_id="test-correlation",
-            dry_run=True,
-            config=test_config,
-        )
-
-        # Create playbook
-        playbook = DunningPlaybook(test_config)
-
         # Run multiple times
-        result1 = playbook.run_once(context)
-        result2 = playbook.run_once(context)
+        result1 = light_playbook.run_once(light_context)
+        result2 = light_playbook.run_once(light_context)
 
         # Results should be identical
         assert result1.success == result2.success
         assert result1.notices_created == result2.notices_created
         assert result1.events_dispatched == result2.events_dispatched
 
-    @patch("agents.mahnwesen.playbooks.ReadApiClient")
-    @patch("agents.mahnwesen.playbooks.OutboxClient")
-    def test_empty_invoice_list(self, mock_outbox, mock_read_api, test_config):
+    def test_empty_invoice_list(self, clients, light_playbook, light_context):
         """Test handling of empty invoice list."""
-        # Setup mocks
-        mock_read_api.return_value.get_overdue_invoices.return_value = Mock(invoices=[])
-
-        # Create context
-        context = DunningContext(
-            tenant_id="test-tenant",
-            correlation_id="test-correlation",
-            dry_run=True,
-            config=test_config,
-        )
-
-        # Create playbook
-        playbook = DunningPlaybook(test_config)
+        clients["ReadApiClient"].return_value.get_overdue_invoices.return_value = _EMPTY_PAGE
 
         # Run dry-run
-        result = playbook.run_once(context)
+        result = light_playbook.run_once(light_context)
 
         # Verify results
         assert result.success
@@ -225,12 +219,12 @@ class TestMVREispatchDryRun:
         assert result.events_dispatched == 0
         assert "No overdue invoices found" in result.warnings
 
-    @patch("agents.mahnwesen.playbooks.ReadApiClient")
-    @patch("agents.mahnwesen.playbooks.OutboxClient")
-    def test_error_handling(self, mock_outbox, mock_read_api, test_config):
+    def test_error_handling(self, clients, test_config, approval_store):
         """Test error handling in dry-run mode."""
-        # Setup mocks to raise exception
-        mock_read_api.return_value.get_overdue_invoices.side_effect = Exception("API Error")
+        # Make the read API raise
+        clients["ReadApiClient"].return_value.get_overdue_invoices.side_effect = Exception(
+            "API Error"
+        )
 
         # Create context
         context = DunningContext(
@@ -238,6 +232,7 @@ class TestMVREispatchDryRun:
             correlation_id="test-correlation",
             dry_run=True,
             config=test_config,
+            approval_store=approval_store,
         )
 
         # Create playbook
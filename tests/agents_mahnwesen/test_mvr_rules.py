@@ -1,11 +1,24 @@
 """Tests for MVR rules and stage determination."""
 
+from collections.abc import Iterator
+from dataclasses import replace
 from datetime import UTC, datetime, timedelta
 
 import pytest
 
 from agents.mahnwesen.config import DunningConfig
 from agents.mahnwesen.mvr import DunningStage, MVREngine, OverdueInvoice
+from tests.agents_mahnwesen._fixtures import seed_rate_limit
+
+_NOW = datetime(2025, 1, 15, 12, 0, tzinfo=UTC)
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _frozen_time() -> Iterator[None]:
+    """Freeze the MVR engine clock for the whole module."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("agents.mahnwesen.mvr._now", lambda: _NOW)
+        yield
 
 
 @pytest.fixture
@@ -28,9 +41,9 @@ def mvr_engine(test_config):
     return MVREngine(test_config)
 
 
-@pytest.fixture
-def sample_invoice():
-    """Sample overdue invoice."""
+@pytest.fixture(scope="session")
+def _base_invoice():
+    """Overdue invoice template built once per session."""
     return OverdueInvoice(
         invoice_id="INV-001",
         tenant_id="test-tenant",
@@ -38,46 +51,35 @@ def sample_invoice():
         customer_name="Test Customer",
         customer_email="test@example.com",
         amount_cents=5000,  # 50 EUR
-        due_date=datetime.now(UTC) - timedelta(days=20),
+        due_date=_NOW - timedelta(days=20),
         invoice_number="INV-001",
-        created_at=datetime.now(UTC) - timedelta(days=25),
+        created_at=_NOW - timedelta(days=25),
     )
 
 
-class TestMVRRules:
-    """Test MVR rule engine."""
-
-    def test_determine_stage_within_grace_period(self, mvr_engine, sample_invoice):
-        """Test stage determination within grace period."""
-        # Invoice due 1 day ago (within grace period)
-        sample_invoice.due_date = datetime.now(UTC) - timedelta(days=1)
-
-        stage = mvr_engine.determine_dunning_stage(sample_invoice)
-        assert stage == DunningStage.STAGE_1
-
-    def test_determine_stage_1(self, mvr_engine, sample_invoice):
-        """Test stage 1 determination."""
-        # Invoice due 10 days ago
-        sample_invoice.due_date = datetime.now(UTC) - timedelta(days=10)
-
-        stage = mvr_engine.determine_dunning_stage(sample_invoice)
-        assert stage == DunningStage.STAGE_1
+@pytest.fixture
+def sample_invoice(_base_invoice):
+    """Sample overdue invoice (a fresh copy of the session template)."""
+    return replace(_base_invoice)
 
-    def test_determine_stage_2(self, mvr_engine, sample_invoice):
-        """Test stage 2 determination."""
-        # Invoice due 20 days ago
-        sample_invoice.due_date = datetime.now(UTC) - timedelta(days=20)
 
-        stage = mvr_engine.determine_dunning_stage(sample_invoice)
-        assert stage == DunningStage.STAGE_2
+class TestMVRRules:
+    """Test MVR rule engine."""
 
-    def test_determine_stage_3(self, mvr_engine, sample_invoice):
-        """Test stage 3 determination."""
-        # Invoice due 40 days ago
-        sample_invoice.due_date = datetime.now(UTC) - timedelta(days=40)
+    @pytest.mark.parametrize(
+        ("days", "expected"),
+        [
+            (1, DunningStage.STAGE_1),  # within grace period
+            (10, DunningStage.STAGE_1),
+            (20, DunningStage.STAGE_2),
+            (40, DunningStage.STAGE_3),
+        ],
+    )
+    def test_determine_stage(self, mvr_engine, sample_invoice, days, expected):
+        """Test stage determination by days overdue."""
+        invoice = replace(sample_invoice, due_date=_NOW - timedelta(days=days))
 
-        stage = mvr_engine.determine_dunning_stage(sample_invoice)
-        assert stage == DunningStage.STAGE_3
+        assert mvr_engine.determine_dunning_stage(invoice) == expected
 
     def test_should_send_minimum_amount(self, mvr_engine, sample_invoice):
         """Test minimum amount threshold."""
@@ -89,31 +91,39 @@ class TestMVRRules:
         assert "Amount" in decision.reason
         assert decision.rate_limit_ok
 
-    def test_should_send_stop_listed(self, mvr_engine, sample_invoice, test_config):
+    def test_should_send_stop_listed(self, sample_invoice, test_config):
         """Test stop list filtering."""
-        # Add stop list pattern
-        test_config.stop_list_patterns = ["TEST-.*"]
+        # Clone the shared config with a stop list pattern
+        engine = MVREngine(replace(test_config, stop_list_patterns=["TEST-.*"]))
         sample_invoice.invoice_number = "TEST-001"
 
-        decision = mvr_engine.should_send_dunning(sample_invoice, DunningStage.STAGE_1)
+        decision = engine.should_send_dunning(sample_invoice, DunningStage.STAGE_1)
         assert not decision.should_send
         assert "stop-listed" in decision.reason
 
     def test_should_send_rate_limit(self, mvr_engine, sample_invoice):
         """Test rate limiting."""
-        # Exhaust rate limit
-        for _i in range(10):  # Max 10 per hour
-            mvr_engine._check_rate_limit("test-tenant")
+        # Exhaust rate limit (max 10 per hour)
+        seed_rate_limit(mvr_engine, "test-tenant", 10)
 
         decision = mvr_engine.should_send_dunning(sample_invoice, DunningStage.STAGE_1)
         assert not decision.should_send
         assert "Rate limit" in decision.reason
         assert not decision.rate_limit_ok
 
+    def test_rate_limit_window_drops_expired_entries(self, mvr_engine, sample_invoice):
+        """Test that sends older than an hour no longer count against the limit."""
+        window = mvr_engine._get_rate_limit_window("test-tenant")
+        window.extend([_NOW - timedelta(hours=2)] * 10)
+
+        decision = mvr_engine.should_send_dunning(sample_invoice, DunningStage.STAGE_1)
+        assert decision.rate_limit_ok
+        assert list(window) == [_NOW]
+
     def test_should_send_recent_dunning(self, mvr_engine, sample_invoice):
         """Test recent dunning check."""
         # Set last dunning sent recently
-        sample_invoice.last_dunning_sent = datetime.now(UTC) - timedelta(hours=12)
+        sample_invoice.last_dunning_sent = _NOW - timedelta(hours=12)
 
         decision = mvr_engine.should_send_dunning(sample_invoice, DunningStage.STAGE_1)
         assert not decision.should_send
@@ -127,19 +137,14 @@ class TestMVRRules:
         assert decision.rate_limit_ok
         assert decision.idempotency_key is not None
 
-    def test_idempotency_key_deterministic(self, mvr_engine, sample_invoice):
-        """Test that idempotency keys are deterministic."""
+    def test_idempotency_keys(self, mvr_engine, sample_invoice):
+        """Test that idempotency keys are deterministic and differ per stage."""
         decision1 = mvr_engine.should_send_dunning(sample_invoice, DunningStage.STAGE_1)
         decision2 = mvr_engine.should_send_dunning(sample_invoice, DunningStage.STAGE_1)
+        decision3 = mvr_engine.should_send_dunning(sample_invoice, DunningStage.STAGE_2)
 
         assert decision1.idempotency_key == decision2.idempotency_key
-
-    def test_idempotency_key_different_stages(self, mvr_engine, sample_invoice):
-        """Test that different stages produce different keys."""
-        decision1 = mvr_engine.should_send_dunning(sample_invoice, DunningStage.STAGE_1)
-        decision2 = mvr_engine.should_send_dunning(sample_invoice, DunningStage.STAGE_2)
-
-        assert decision1.idempotency_key != decision2.idempotency_key
+        assert decision1.idempotency_key != decision3.idempotency_key
 
     def test_process_invoices(self, mvr_engine, sample_invoice):
         """Test processing multiple invoices."""
@@ -154,6 +159,16 @@ class TestMVRRules:
         assert invoice.invoice_id == "INV-001"
         assert decision.should_send
 
+    def test_rate_limit_follows_raised_limit(self, mvr_engine):
+        """Test that raising the hourly limit on a live engine still enforces it."""
+        mvr_engine.config.max_notices_per_hour = 3
+        checks = [mvr_engine._check_rate_limit("test-tenant") for _ in range(4)]
+        assert checks == [True, True, True, False]
+
+        mvr_engine.config.max_notices_per_hour = 5
+        checks = [mvr_engine._check_rate_limit("test-tenant") for _ in range(3)]
+        assert checks == [True, True, False]
+
     def test_rate_limit_status(self, mvr_engine):
         """Test rate limit status reporting."""
         status = mvr_engine.get_rate_limit_status("test-tenant")
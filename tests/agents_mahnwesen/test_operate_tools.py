@@ -9,6 +9,8 @@ from tools.operate.alert_emitter import ALERT_THRESHOLDS, build_alert
 from tools.operate.canary_decision import CanaryThresholds, evaluate_canary
 from tools.operate.kill_switch import apply_kill_switch
 
+_THRESH = CanaryThresholds()
+
 
 def test_build_alert_uses_threshold_and_sets_severity() -> None:
     payload = build_alert(
@@ -36,26 +38,33 @@ def test_evaluate_canary(success, error, dlq, bounce, expected) -> None:
         error_rate=error,
         dlq_depth=dlq,
         hard_bounce_rate=bounce,
-        thresholds=CanaryThresholds(),
+        thresholds=_THRESH,
     )
     assert decision == expected
     if decision == "HOLD":
         assert reasons and any("exceeds" in r.lower() or "below" in r.lower() for r in reasons)
 
 
-def test_apply_kill_switch_idempotent(tmp_path: Path) -> None:
+@pytest.fixture(scope="module")
+def kill_switch_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Root for kill-switch state; each test writes below its own tenant subdirectory."""
+    return tmp_path_factory.mktemp("kill_switch")
+
+
+def test_apply_kill_switch_idempotent(kill_switch_dir: Path) -> None:
     tenant = "tenant-test"
+    state_dir = kill_switch_dir / tenant
     payload1 = apply_kill_switch(
         tenant_id=tenant,
         reason="Backout test",
         trace_id="trace-1",
-        state_dir=tmp_path,
+        state_dir=state_dir,
     )
     payload2 = apply_kill_switch(
         tenant_id=tenant,
         reason="New reason should not replace",
         trace_id="trace-2",
-        state_dir=tmp_path,
+        state_dir=state_dir,
     )
 
     assert payload1["kill_switch"] is True
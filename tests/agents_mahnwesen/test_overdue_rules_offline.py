@@ -13,6 +13,12 @@ from agents.mahnwesen.dto import DunningChannel, DunningStage
 from agents.mahnwesen.policies import DunningPolicies, OverdueInvoice
 
 
+@pytest.fixture(scope="module")
+def now():
+    """Current timestamp, captured once for the module."""
+    return datetime.now(UTC)
+
+
 class TestOverdueRules:
     """Test overdue invoice business rules."""
 
@@ -33,11 +39,6 @@ class TestOverdueRules:
         """Create test policies."""
         return DunningPolicies(config)
 
-    @pytest.fixture
-    def now(self):
-        """Get current timestamp for testing."""
-        return datetime.now(UTC)
-
     @pytest.fixture
     def sample_invoice(self, now):
         """Create sample overdue invoice."""
@@ -106,6 +107,18 @@ class TestOverdueRules:
         stage = policies.determine_dunning_stage(invoice, now)
         assert stage == DunningStage.STAGE_1
 
+    def test_stage_follows_threshold_changes(self, config, policies, sample_invoice, now):
+        """Test that threshold edits after construction apply, ordered or not."""
+        assert policies.determine_dunning_stage(sample_invoice, now) == DunningStage.STAGE_1
+
+        config.stage_2_threshold = 5
+        assert policies.determine_dunning_stage(sample_invoice, now) == DunningStage.STAGE_2
+
+        # Out-of-order thresholds keep the highest-stage-first semantics
+        config.stage_1_threshold = 10
+        assert policies.determine_dunning_stage(sample_invoice, now) == DunningStage.STAGE_2
+        assert policies.determine_dunning_stages([sample_invoice], now) == [DunningStage.STAGE_2]
+
     def test_minimum_amount_filter(self, policies, sample_invoice, now):
         """Test minimum amount filtering."""
         # Invoice below minimum amount
@@ -129,6 +142,24 @@ class TestOverdueRules:
         assert not should_issue
         assert error_msg is not None
 
+    def test_stop_list_tracks_pattern_changes(self, config):
+        """Test that the compiled stop list follows later pattern edits."""
+        config.stop_list_patterns = [r"^TEST-"]
+        assert config.is_stop_listed("test-001")
+        assert not config.is_stop_listed("HOLD-001")
+
+        config.stop_list_patterns.append(r"^HOLD-\d+$")
+        assert config.is_stop_listed("HOLD-001")
+
+        config.stop_list_patterns.clear()
+        assert not config.is_stop_listed("TEST-001")
+
+    def test_stop_list_keeps_inline_flags(self, config):
+        """Test that patterns with leading inline flags compile on their own."""
+        config.stop_list_patterns = [r"^TEST-", r"(?x) ^HOLD- \d+ $"]
+        assert config.is_stop_listed("HOLD-001")
+        assert not config.is_stop_listed("HOLD-X")
+
     def test_maximum_stage_filter(self, policies, sample_invoice, now):
         """Test maximum stage filtering."""
         # Invoice already at maximum stage
@@ -173,13 +204,13 @@ class TestOverdueRules:
         channel = policies.determine_dunning_channel(invoice, stage)
         assert channel == DunningChannel.LETTER
 
-    def test_channel_determination_no_email(self, policies):
+    def test_channel_determination_no_email(self, policies, now):
         """Test channel determination without email."""
         invoice = OverdueInvoice(
             invoice_id="INV-003",
             tenant_id="00000000-0000-0000-0000-000000000001",
             invoice_number="2024-003",
-            due_date=datetime.now(UTC) - timedelta(days=20),
+            due_date=now - timedelta(days=20),
             amount_cents=15000,
             customer_email=None,  # No email
         )
@@ -202,6 +233,9 @@ class TestOverdueRules:
         fee_3 = policies.calculate_dunning_fee(sample_invoice, DunningStage.STAGE_3)
         assert fee_3 == 1000  # 10.00 EUR
 
+        # No stage, no fee
+        assert policies.calculate_dunning_fee(sample_invoice, DunningStage.NONE) == 0
+
     def test_escalation_delay_calculation(self, policies):
         """Test escalation delay calculation."""
         # Stage 1 to Stage 2
@@ -212,6 +246,14 @@ class TestOverdueRules:
         delay_2_3 = policies.get_escalation_delay_days(DunningStage.STAGE_2, DunningStage.STAGE_3)
         assert delay_2_3 == 16  # 30 - 14 = 16 days
 
+        # No direct escalation path
+        assert policies.get_escalation_delay_days(DunningStage.STAGE_1, DunningStage.STAGE_3) == 0
+        assert policies.get_escalation_delay_days(DunningStage.STAGE_3, DunningStage.STAGE_1) == 0
+
+        # Table follows threshold changes
+        policies.config.stage_2_threshold = 20
+        assert policies.get_escalation_delay_days(DunningStage.STAGE_1, DunningStage.STAGE_2) == 17
+
     def test_filter_overdue_invoices(self, policies, now):
         """Test filtering of overdue invoices."""
         # Create test invoices
@@ -311,3 +353,20 @@ class TestOverdueRules:
 
         stage = policies.determine_dunning_stage(invoice, now)
         assert stage == expected_stage
+
+    def test_batch_stages_match_scalar(self, policies, now):
+        """Test that batch stage determination agrees with the scalar path."""
+        invoices = [
+            OverdueInvoice(
+                invoice_id=f"INV-{n:03d}",
+                tenant_id="00000000-0000-0000-0000-000000000001",
+                invoice_number=f"2024-{n:03d}",
+                due_date=now - timedelta(days=n),
+                amount_cents=15000,
+            )
+            for n in range(40)
+        ]
+
+        assert policies.determine_dunning_stages(invoices, now) == [
+            policies.determine_dunning_stage(invoice, now) for invoice in invoices
+        ]
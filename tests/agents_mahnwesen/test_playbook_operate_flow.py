@@ -1,7 +1,5 @@
 """Tests for DunningPlaybook operate flow — auto-generated via PDD."""
 
-from unittest.mock import MagicMock
-
 import pytest
 
 from agents.mahnwesen.approval_store import ApprovalStore
@@ -13,15 +11,33 @@ from agents.mahnwesen.dto import DunningNotice
 TENANT_ID = "00000000-0000-0000-0000-000000000001"
 
 
+class _StubOutbox:
+    """Outbox stand-in: nothing is a duplicate and every publish succeeds."""
+
+    @staticmethod
+    def check_duplicate_event(*args, **kwargs) -> bool:
+        return False
+
+    @staticmethod
+    def publish_dunning_issued(*args, **kwargs) -> bool:
+        return True
+
+
 @pytest.fixture
 def approval_store(tmp_path) -> ApprovalStore:
     return ApprovalStore(base_path=tmp_path)
 
 
+@pytest.fixture(scope="module")
+def overdue_provider() -> LocalOverdueProvider:
+    return LocalOverdueProvider()
+
+
 def _build_context(
     *,
     dry_run: bool,
     approval_store: ApprovalStore,
+    overdue_provider: LocalOverdueProvider,
     requester: str = "pytest",
 ) -> DunningContext:
     return DunningContext(
@@ -30,13 +46,17 @@ def _build_context(
         dry_run=dry_run,
         limit=10,
         approval_store=approval_store,
-        overdue_provider=LocalOverdueProvider(),
+        overdue_provider=overdue_provider,
         requester=requester,
     )
 
 
-def test_run_once_blocks_stage2_without_approval(approval_store: ApprovalStore) -> None:
-    context = _build_context(dry_run=True, approval_store=approval_store)
+def test_run_once_blocks_stage2_without_approval(
+    approval_store: ApprovalStore, overdue_provider: LocalOverdueProvider
+) -> None:
+    context = _build_context(
+        dry_run=True, approval_store=approval_store, overdue_provider=overdue_provider
+    )
     playbook = DunningPlaybook(context.config)
 
     result = playbook.run_once(context)
@@ -49,9 +69,13 @@ def test_run_once_blocks_stage2_without_approval(approval_store: ApprovalStore)
     assert all(entry["stage"] == 1 for entry in prepared)
 
 
-def test_run_once_dispatches_after_approval(monkeypatch, approval_store: ApprovalStore) -> None:
+def test_run_once_dispatches_after_approval(
+    monkeypatch, approval_store: ApprovalStore, overdue_provider: LocalOverdueProvider
+) -> None:
     # Initial preview to register pending approval
-    preview_context = _build_context(dry_run=True, approval_store=approval_store)
+    preview_context = _build_context(
+        dry_run=True, approval_store=approval_store, overdue_provider=overdue_provider
+    )
     playbook = DunningPlaybook(preview_context.config)
     playbook.run_once(preview_context)
 
@@ -69,7 +93,12 @@ def test_run_once_dispatches_after_approval(monkeypatch, approval_store: Approva
     )
 
     # Live run with patched Brevo and Outbox
-    live_context = _build_context(dry_run=False, approval_store=approval_store, requester="runner")
+    live_context = _build_context(
+        dry_run=False,
+        approval_store=approval_store,
+        overdue_provider=overdue_provider,
+        requester="runner",
+    )
 
     def _fake_send(notice: DunningNotice, context: DunningContext):
         class Response:
@@ -81,10 +110,7 @@ def test_run_once_dispatches_after_approval(monkeypatch, approval_store: Approva
 
     monkeypatch.setattr(DunningPlaybook, "_send_via_brevo", lambda self, notice, ctx: _fake_send(notice, ctx))
 
-    fake_outbox = MagicMock()
-    fake_outbox.check_duplicate_event.return_value = False
-    fake_outbox.publish_dunning_issued.return_value = True
-    live_context.outbox_client = fake_outbox
+    live_context.outbox_client = _StubOutbox()
 
     result = playbook.run_once(live_context)
 
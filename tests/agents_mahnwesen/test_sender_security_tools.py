@@ -21,9 +21,9 @@ def test_build_expectations_contains_records() -> None:
 
 def test_build_report_structure(tmp_path: Path) -> None:
     report = build_report("tenant-test", "example.com")
-    assert report["status"] == "EXPECTED"
-    assert len(report["records"]) >= 4
-    record_names = [rec["name"] for rec in report["records"]]
+    assert report.status == "EXPECTED"
+    assert len(report.records) >= 4
+    record_names = [rec.name for rec in report.records]
     assert "_dmarc.example.com" in record_names
 
 
@@ -31,9 +31,10 @@ def test_build_probe_env_status(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setenv("BREVO_API_KEY", "***")
     monkeypatch.delenv("BREVO_SENDER_NAME", raising=False)
     probe = build_probe("tenant-id")
-    assert probe["env_status"]["BREVO_API_KEY"] == "SET"
-    assert probe["env_status"]["BREVO_SENDER_NAME"] == "UNSET"
-    assert probe["bounce_policy"]["soft"]["max_attempts"] == 3
+    assert probe.env_status["BREVO_API_KEY"] == "SET"
+    assert probe.env_status["BREVO_SENDER_NAME"] == "UNSET"
+    assert probe.bounce_policy["soft"]["max_attempts"] == 3
+    assert probe.to_dict()["env_status"] == dict(probe.env_status)
 
 
 @pytest.mark.parametrize(
@@ -47,3 +48,9 @@ def test_build_probe_env_status(monkeypatch: pytest.MonkeyPatch) -> None:
 def test_mask_text(text: str, expected: str) -> None:
     assert expected in mask_text(text)
 
+
+
+def test_mask_text_overlapping_phone_and_email() -> None:
+    masked = mask_text("030 123 4567@x.de")
+    assert "x.de" not in masked
+    assert "4567" not in masked
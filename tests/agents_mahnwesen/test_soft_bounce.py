@@ -1,9 +1,18 @@
 """Tests for Soft-Bounce Policy (3 attempts in 72h)."""
 
-from datetime import UTC, datetime, timedelta
+import time
+from datetime import UTC, datetime
 
 from backend.integrations.brevo_client import BrevoClient
 
+_HOUR_NS = 3600 * 1_000_000_000
+
+
+def _seed_attempts(client: BrevoClient, email: str, *hours_ago: float) -> None:
+    """Pre-load soft-bounce attempts recorded ``hours_ago`` (oldest first)."""
+    now_ns = time.time_ns()
+    client._soft_bounces[email.lower()].extend(int(now_ns - h * _HOUR_NS) for h in hours_ago)
+
 
 class TestSoftBouncePolicy:
     """Test soft-bounce policy: max 3 attempts in 72h."""
@@ -62,15 +71,25 @@ class TestSoftBouncePolicy:
         status = client.get_soft_bounce_status(email)
         assert not status["can_retry"]
 
+    def test_attempts_report_real_count_above_policy_maximum(self):
+        """Test that attempts beyond the policy maximum are still counted."""
+        client = BrevoClient()
+        email = "test@example.com"
+
+        for _ in range(5):
+            client.record_soft_bounce(email)
+
+        status = client.get_soft_bounce_status(email)
+        assert status["attempts"] == 5
+        assert "(5 attempts)" in status["reason"]
+
     def test_old_attempts_cleaned_up(self):
         """Test that attempts older than 72h are cleaned up."""
         client = BrevoClient()
         email = "test@example.com"
 
         # Simulate old attempts (outside 72h window)
-        now = datetime.now(UTC)
-        old_timestamp = now - timedelta(hours=73)
-        client._soft_bounces[email.lower()] = [old_timestamp, old_timestamp]
+        _seed_attempts(client, email, 73, 73)
 
         # Record new attempt
         client.record_soft_bounce(email)
@@ -84,12 +103,8 @@ class TestSoftBouncePolicy:
         client = BrevoClient()
         email = "test@example.com"
 
-        now = datetime.now(UTC)
-
         # Simulate 2 attempts: one old, one recent
-        old_timestamp = now - timedelta(hours=73)
-        recent_timestamp = now - timedelta(hours=1)
-        client._soft_bounces[email.lower()] = [old_timestamp, recent_timestamp]
+        _seed_attempts(client, email, 73, 1)
 
         # Check policy - only recent attempt counts
         can_retry, reason = client._check_soft_bounce_policy(email)
@@ -10,7 +10,7 @@ from datetime import UTC, datetime
 from typing import Any, Dict, List, Tuple
 
 
-@dataclass
+@dataclass(frozen=True)
 class CanaryThresholds:
     success_rate: float = 0.97
     error_rate: float = 0.01
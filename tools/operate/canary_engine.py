@@ -15,6 +15,16 @@ from zoneinfo import ZoneInfo
 ARTIFACT_ROOT = Path("artifacts/reports/mahnwesen")
 TZ_EUROPE_BERLIN = ZoneInfo("Europe/Berlin")
 
+# Machine-readable counterparts of the human-readable decision reasons
+REASON_MIN_NOTICES = "MIN_NOTICES_NOT_MET"
+REASON_ERROR_RATE = "ERROR_RATE_EXCEEDED"
+REASON_HARD_BOUNCE_RATE = "HARD_BOUNCE_RATE_EXCEEDED"
+REASON_DLQ_DEPTH = "DLQ_DEPTH_EXCEEDED"
+REASON_RETRY_DEPTH = "RETRY_DEPTH_EXCEEDED"
+REASON_BLOCKLIST_RATIO = "BLOCKLIST_RATIO_EXCEEDED"
+REASON_SEVERE_BREACH = "SEVERE_BREACH"
+REASON_ROLLOUT_COMPLETE = "ROLLOUT_COMPLETE"
+
 
 @dataclass
 class Thresholds:
@@ -111,6 +121,7 @@ def determine_next_action(
     blocklist_stats: dict[str, Any],
     state: dict[str, Any],
     thresholds: Thresholds,
+    now: datetime | None = None,
 ) -> dict[str, Any]:
     metrics = kpi.get("metrics", {})
     notices_sent = metrics.get("notices_sent", 0)
@@ -123,31 +134,37 @@ def determine_next_action(
     error_rate = errors / max(1, notices_sent)
 
     reasons: list[str] = []
+    reason_codes: list[str] = []
 
     if notices_sent < thresholds.min_notices:
         reasons.append(
             f"Notices sent {notices_sent} below minimum {thresholds.min_notices}"
         )
+        reason_codes.append(REASON_MIN_NOTICES)
 
     if error_rate > thresholds.error_rate:
         reasons.append(
             f"Error rate {error_rate:.3f} exceeds threshold {thresholds.error_rate:.3f}"
         )
+        reason_codes.append(REASON_ERROR_RATE)
 
     if hard_bounce_rate > thresholds.hard_bounce_rate:
         reasons.append(
             f"Hard bounce rate {hard_bounce_rate:.3f} exceeds threshold {thresholds.hard_bounce_rate:.3f}"
         )
+        reason_codes.append(REASON_HARD_BOUNCE_RATE)
 
     if dlq_depth > thresholds.dlq_depth:
         reasons.append(
             f"DLQ depth {dlq_depth} exceeds threshold {thresholds.dlq_depth}"
         )
+        reason_codes.append(REASON_DLQ_DEPTH)
 
     if retry_depth > thresholds.retry_depth:
         reasons.append(
             f"Retry depth {retry_depth} exceeds threshold {thresholds.retry_depth}"
         )
+        reason_codes.append(REASON_RETRY_DEPTH)
 
     blocklist_total = blocklist_stats.get("total", 0)
     blocklist_hard = blocklist_stats.get("hard", 0)
@@ -156,6 +173,7 @@ def determine_next_action(
         reasons.append(
             f"Hard blocklist ratio {blocklist_rate:.3f} exceeds threshold {thresholds.hard_bounce_rate:.3f}"
         )
+        reason_codes.append(REASON_BLOCKLIST_RATIO)
 
     current_pct = int(state.get("rollout_percentage", 10) or 10)
 
@@ -172,6 +190,7 @@ def determine_next_action(
         recommended = "BACKOUT"
         if not reasons:
             reasons.append("Severe threshold breach detected")
+            reason_codes.append(REASON_SEVERE_BREACH)
     elif reasons:
         recommended = "HOLD"
     else:
@@ -179,16 +198,18 @@ def determine_next_action(
         if recommended == "GO_100" and current_pct >= 100:
             recommended = "HOLD"
             reasons.append("Tenant already at 100 % rollout")
+            reason_codes.append(REASON_ROLLOUT_COMPLETE)
         else:
             action_notes.append(f"Advance rollout to {recommended.split('_')[1]} %")
 
     decision = {
         "tenant_id": tenant_id,
         "report_date": report_date.isoformat(),
-        "generated_at": datetime.now(UTC).isoformat(),
+        "generated_at": (now or datetime.now(UTC)).isoformat(),
         "current_percentage": current_pct,
         "recommended_action": recommended,
         "reasons": reasons or action_notes or ["Thresholds satisfied"],
+        "reason_codes": reason_codes,
         "metrics": {
             "error_rate": round(error_rate, 4),
             "hard_bounce_rate": round(hard_bounce_rate, 4),
@@ -294,12 +315,19 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     return parser.parse_args(argv)
 
 
-def generate_decision(tenant_id: str, report_date: date, base_path: Path = ARTIFACT_ROOT) -> dict[str, Any]:
+def generate_decision(
+    tenant_id: str,
+    report_date: date,
+    base_path: Path = ARTIFACT_ROOT,
+    now: datetime | None = None,
+) -> dict[str, Any]:
     kpi = load_kpi_metrics(tenant_id, report_date, base_path=base_path)
     blocklist_stats = load_blocklist_stats(tenant_id, base_path=base_path)
     state = load_operate_state(tenant_id, base_path=base_path)
     thresholds = load_thresholds(tenant_id)
-    return determine_next_action(tenant_id, report_date, kpi, blocklist_stats, state, thresholds)
+    return determine_next_action(
+        tenant_id, report_date, kpi, blocklist_stats, state, thresholds, now=now
+    )
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -309,8 +337,8 @@ def main(argv: list[str] | None = None) -> int:
     else:
         report_date = datetime.now(TZ_EUROPE_BERLIN).date()
 
-    decision = generate_decision(args.tenant, report_date)
     now = datetime.now(UTC)
+    decision = generate_decision(args.tenant, report_date, now=now)
     json_path, md_path = write_decision(args.tenant, decision, report_date, now)
 
     output = {
@@ -16,7 +16,7 @@ import statistics
 from dataclasses import dataclass, field
 from datetime import UTC, date, datetime, timedelta
 from pathlib import Path
-from typing import Iterable, Protocol
+from typing import Any, Callable, Iterable, Protocol
 from zoneinfo import ZoneInfo
 
 from agents.mahnwesen.providers import LocalOverdueProvider
@@ -82,21 +82,35 @@ def _parse_datetime(value: str | None) -> datetime | None:
     return datetime.fromisoformat(value)
 
 
+def _load_json(path: Path) -> Any:
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
 class LocalArtifactDataSource:
-    """Default data source using local operate artefacts."""
+    """Default data source using local operate artefacts.
 
-    def __init__(self, base_path: Path | None = None) -> None:
+    ``reader`` maps an artefact path to its parsed JSON (``None`` if absent);
+    tests can pass a dict-backed reader to bypass the filesystem.
+    """
+
+    def __init__(
+        self,
+        base_path: Path | None = None,
+        reader: Callable[[Path], Any] | None = None,
+    ) -> None:
         self.base_path = base_path or ARTIFACT_ROOT
         self.overdue_provider = LocalOverdueProvider()
+        self._read = reader or _load_json
 
     def load(self, tenant_id: str, start: datetime, end: datetime) -> RawKpiData:
         tenant_dir = self.base_path / tenant_id
         lifecycles = []
         metadata: dict[str, object] = {}
 
-        approvals_file = tenant_dir / "audit" / "approvals.json"
-        if approvals_file.exists():
-            data = json.loads(approvals_file.read_text(encoding="utf-8"))
+        data = self._read(tenant_dir / "audit" / "approvals.json")
+        if data is not None:
             raw_records = data.get("records", [])
             if isinstance(raw_records, dict):
                 iterable = raw_records.values()
@@ -137,19 +151,17 @@ class LocalArtifactDataSource:
                     )
                 )
 
-        outbox_file = tenant_dir / "outbox" / "sent.json"
         outbox_sent_count = 0
-        if outbox_file.exists():
-            outbox_data = json.loads(outbox_file.read_text(encoding="utf-8"))
+        outbox_data = self._read(tenant_dir / "outbox" / "sent.json")
+        if outbox_data is not None:
             outbox_keys: list[str] = outbox_data.get("keys", [])
             outbox_sent_count = len({k for k in outbox_keys})
-            metadata["outbox_keys"] = outbox_keys
+            metadata["outbox_keys"] = list(outbox_keys)
 
-        blocklist_file = tenant_dir / "ops" / "blocklist.json"
         hard_bounces = 0
         soft_bounces = 0
-        if blocklist_file.exists():
-            block_data = json.loads(blocklist_file.read_text(encoding="utf-8"))
+        block_data = self._read(tenant_dir / "ops" / "blocklist.json")
+        if block_data is not None:
             entries: dict[str, dict[str, object]] = block_data.get("entries", {})
             for entry in entries.values():
                 status = entry.get("status")
@@ -162,9 +174,8 @@ class LocalArtifactDataSource:
         escalate_count = sum(1 for item in lifecycles if item.stage >= 3)
 
         queue_metrics = QueueMetrics()
-        queue_file = tenant_dir / "ops" / "queue_metrics.json"
-        if queue_file.exists():
-            queue_data = json.loads(queue_file.read_text(encoding="utf-8"))
+        queue_data = self._read(tenant_dir / "ops" / "queue_metrics.json")
+        if queue_data is not None:
             queue_metrics.retry_depth = int(queue_data.get("retry_depth", 0))
             queue_metrics.dlq_depth = int(queue_data.get("dlq_depth", 0))
 
@@ -193,6 +193,7 @@ def run_morning_for_tenant(
         blocklist_stats,
         state,
         thresholds,
+        now=now_utc,
     )
 
     decision_json_path = None
@@ -271,6 +272,7 @@ def run_morning_for_tenant(
         "summary_md": str(summary_path),
         "decision": decision["recommended_action"],
         "rollout_changed": rollout_info.get("changed"),
+        "rollout_state": rollout_info["after"],
         "overrides": overrides,
     }
 
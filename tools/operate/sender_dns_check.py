@@ -7,13 +7,14 @@ verifies records against real DNS lookups using dig.
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import re
 import subprocess
-from dataclasses import dataclass, replace
+from dataclasses import asdict, dataclass, replace
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Iterable
 
 
 ARTIFACT_ROOT = Path("artifacts/reports/mahnwesen")
@@ -28,71 +29,68 @@ class DnsExpectation:
     actual_value: str | None = None
 
 
-def build_expectations_brevo(domain: str) -> list[DnsExpectation]:
-    """Build DNS expectations for Brevo provider."""
-    dkim1 = f"brevo1._domainkey.{domain}"
-    dkim2 = f"brevo2._domainkey.{domain}"
-    return [
-        DnsExpectation(
-            record_type="SPF",
-            name=domain,
-            expected_value="v=spf1 include:spf.brevo.com ~all or -all",
-        ),
-        DnsExpectation(
-            record_type="DKIM",
-            name=dkim1,
-            expected_value="CNAME b1.dppfor-eu.dkim.brevo.com.",
-        ),
+@dataclass(slots=True, frozen=True)
+class DnsReport:
+    """Sender DNS report; converted to a dict only for JSON output."""
+
+    tenant_id: str
+    domain: str
+    provider: str | None
+    generated_at: str
+    status: str
+    verified_count: int
+    total_count: int
+    records: tuple[DnsExpectation, ...]
+    notes: tuple[str, ...]
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+# (record_type, name template, expected value template); "{d}" is the domain
+_BREVO_TEMPLATES: tuple[tuple[str, str, str], ...] = (
+    ("SPF", "{d}", "v=spf1 include:spf.brevo.com ~all or -all"),
+    ("DKIM", "brevo1._domainkey.{d}", "CNAME b1.dppfor-eu.dkim.brevo.com."),
+    ("DKIM", "brevo2._domainkey.{d}", "CNAME b2.dppfor-eu.dkim.brevo.com."),
+    ("DMARC", "_dmarc.{d}", "v=DMARC1; p=..."),
+)
+
+# Legacy default (deprecated)
+_LEGACY_TEMPLATES: tuple[tuple[str, str, str], ...] = (
+    ("SPF", "{d}", "v=spf1 include:spf.brevo.com -all"),
+    ("DKIM", "brevo._domainkey.{d}", "CNAME brevo.domainkey.brevo.com"),
+    ("DKIM", "brevo2._domainkey.{d}", "CNAME brevo2.domainkey.brevo.com"),
+    ("DMARC", "_dmarc.{d}", "v=DMARC1; p=none; rua=mailto:postmaster@{d}"),
+    ("MX", "mail.{d}", "<tenant mail relay> (manual verification)"),
+)
+
+
+def _expand(templates: tuple[tuple[str, str, str], ...], domain: str) -> tuple[DnsExpectation, ...]:
+    return tuple(
         DnsExpectation(
-            record_type="DKIM",
-            name=dkim2,
-            expected_value="CNAME b2.dppfor-eu.dkim.brevo.com.",
-        ),
-        DnsExpectation(
-            record_type="DMARC",
-            name=f"_dmarc.{domain}",
-            expected_value="v=DMARC1; p=...",
-        ),
-    ]
+            record_type=record_type,
+            name=name.format(d=domain),
+            expected_value=value.format(d=domain),
+        )
+        for record_type, name, value in templates
+    )
+
+
+def build_expectations_brevo(domain: str) -> tuple[DnsExpectation, ...]:
+    """Build DNS expectations for Brevo provider."""
+    return _expand(_BREVO_TEMPLATES, domain)
 
 
-def build_expectations(domain: str, provider: str | None = None) -> list[DnsExpectation]:
-    """Build DNS expectations for given domain and provider."""
+@functools.lru_cache(maxsize=256)
+def build_expectations(domain: str, provider: str | None = None) -> tuple[DnsExpectation, ...]:
+    """Build DNS expectations for given domain and provider.
+
+    Results are cached per (domain, provider); the tuple and its frozen
+    expectations are immutable, so callers can share them.
+    """
     if provider == "brevo":
         return build_expectations_brevo(domain)
-    
-    # Legacy default (deprecated)
-    base = f"mail.{domain}"
-    selector = "brevo"
-    dkim1 = f"{selector}._domainkey.{domain}"
-    dkim2 = f"{selector}2._domainkey.{domain}"
-    return [
-        DnsExpectation(
-            record_type="SPF",
-            name=domain,
-            expected_value="v=spf1 include:spf.brevo.com -all",
-        ),
-        DnsExpectation(
-            record_type="DKIM",
-            name=dkim1,
-            expected_value=f"CNAME {selector}.domainkey.brevo.com",
-        ),
-        DnsExpectation(
-            record_type="DKIM",
-            name=dkim2,
-            expected_value=f"CNAME {selector}2.domainkey.brevo.com",
-        ),
-        DnsExpectation(
-            record_type="DMARC",
-            name=f"_dmarc.{domain}",
-            expected_value="v=DMARC1; p=none; rua=mailto:postmaster@" + domain,
-        ),
-        DnsExpectation(
-            record_type="MX",
-            name=base,
-            expected_value="<tenant mail relay> (manual verification)",
-        ),
-    ]
+    return _expand(_LEGACY_TEMPLATES, domain)
 
 
 def lookup_dns(record_type: str, name: str, verbose: bool = False) -> str | None:
@@ -268,7 +266,7 @@ def build_report(
     provider: str | None = None,
     verify: bool = False,
     verbose: bool = False,
-) -> dict[str, object]:
+) -> DnsReport:
     expectations = build_expectations(domain, provider)
     
     if verify:
@@ -286,49 +284,32 @@ def build_report(
         verified_count = 0
         total_count = len(expectations)
     
-    return {
-        "tenant_id": tenant_id,
-        "domain": domain,
-        "provider": provider,
-        "generated_at": datetime.now(UTC).isoformat(),
-        "status": overall_status,
-        "verified_count": verified_count,
-        "total_count": total_count,
-        "records": [
-            {
-                "record_type": exp.record_type,
-                "name": exp.name,
-                "expected_value": exp.expected_value,
-                "actual_value": exp.actual_value,
-                "status": exp.status,
-            }
-            for exp in expectations
-        ],
-        "notes": [
+    return DnsReport(
+        tenant_id=tenant_id,
+        domain=domain,
+        provider=provider,
+        generated_at=datetime.now(UTC).isoformat(),
+        status=overall_status,
+        verified_count=verified_count,
+        total_count=total_count,
+        records=tuple(expectations),
+        notes=(
             "Auto-verification enabled." if verify else "Log-only report. Use --verify to check DNS records.",
-        ],
-    }
+        ),
+    )
 
 
-def write_outputs(tenant_id: str, domain: str, report: dict[str, object]) -> tuple[Path, Path]:
+def write_outputs(tenant_id: str, domain: str, report: DnsReport) -> tuple[Path, Path]:
     tenant_dir = ARTIFACT_ROOT / tenant_id
     tenant_dir.mkdir(parents=True, exist_ok=True)
     json_path = tenant_dir / "sender_dns_status.json"
     md_path = tenant_dir / "sender_dns_status.md"
 
-    json_path.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    json_path.write_text(
+        json.dumps(report.to_dict(), indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
+    )
 
-    expectations = [
-        DnsExpectation(
-            record_type=rec["record_type"],
-            name=rec["name"],
-            expected_value=rec["expected_value"],
-            status=rec["status"],
-            actual_value=rec.get("actual_value"),
-        )
-        for rec in report["records"]
-    ]
-    markdown = render_markdown(tenant_id, domain, expectations)
+    markdown = render_markdown(tenant_id, domain, report.records)
     md_path.write_text(markdown, encoding="utf-8")
     return json_path, md_path
 
@@ -365,14 +346,14 @@ def main(argv: list[str] | None = None) -> int:
         "provider": args.provider,
         "json_path": str(json_path),
         "markdown_path": str(md_path),
-        "status": report["status"],
-        "verified_count": report["verified_count"],
-        "total_count": report["total_count"],
+        "status": report.status,
+        "verified_count": report.verified_count,
+        "total_count": report.total_count,
     }
     print(json.dumps(summary, ensure_ascii=False, indent=2))
     
     if args.verify:
-        print(f"\nDNS verification complete: {report['verified_count']}/{report['total_count']} records verified.")
+        print(f"\nDNS verification complete: {report.verified_count}/{report.total_count} records verified.")
     else:
         print("\nDNS expectations written (use --verify to check DNS records).")
     return 0
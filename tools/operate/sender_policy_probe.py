@@ -9,6 +9,8 @@ from __future__ import annotations
 import argparse
 import json
 import os
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
@@ -39,25 +41,41 @@ def collect_env_status() -> dict[str, str]:
     return status
 
 
-def build_probe(tenant_id: str) -> dict[str, Any]:
-    return {
-        "tenant_id": tenant_id,
-        "generated_at": datetime.now(UTC).isoformat(),
-        "env_status": collect_env_status(),
-        "bounce_policy": BOUNCE_POLICY,
-        "notes": [
-            "BREVO_* values must be provided via environment variables.",
-            "Hard bounces are blocked immediately.",
-            "Soft bounces are retried up to 3 times within 72 hours, then promoted to hard.",
-        ],
-    }
+PROBE_NOTES = (
+    "BREVO_* values must be provided via environment variables.",
+    "Hard bounces are blocked immediately.",
+    "Soft bounces are retried up to 3 times within 72 hours, then promoted to hard.",
+)
 
 
-def write_probe(tenant_id: str, data: dict[str, Any]) -> Path:
+@dataclass(slots=True, frozen=True)
+class ProbeReport:
+    """Sender policy probe result; converted to a dict only for JSON output."""
+
+    tenant_id: str
+    generated_at: str
+    env_status: Mapping[str, str]
+    bounce_policy: Mapping[str, Mapping[str, Any]]
+    notes: tuple[str, ...] = PROBE_NOTES
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def build_probe(tenant_id: str) -> ProbeReport:
+    return ProbeReport(
+        tenant_id=tenant_id,
+        generated_at=datetime.now(UTC).isoformat(),
+        env_status=collect_env_status(),
+        bounce_policy=BOUNCE_POLICY,
+    )
+
+
+def write_probe(tenant_id: str, report: ProbeReport) -> Path:
     tenant_dir = ARTIFACT_ROOT / tenant_id
     tenant_dir.mkdir(parents=True, exist_ok=True)
     path = tenant_dir / "sender_policy_probe.json"
-    path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    path.write_text(json.dumps(report.to_dict(), indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
     return path
 
 